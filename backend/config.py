@@ -33,6 +33,10 @@ class Config:
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # seconds
     
+    # On-disk cache of raw Data API responses so reruns skip repeated requests (empty path disables it)
+    RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', '')
+    RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '900'))
+    
     # Batch Processing Configuration
     BATCH_SIZE = 100
     COMMIT_INTERVAL = 50  # Commit to database every N records
@@ -42,6 +46,7 @@ class Config:
     
     # Concurrency Configuration
     MAX_WORKERS = int(os.getenv('MAX_WORKERS', '20'))  # Max concurrent threads
+    HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', '64'))  # Concurrent requests for I/O-bound API fetchers
     
     # WebSocket Configuration (for future use)
     WS_URL = os.getenv('WS_URL', 'wss://ws.polymarket.com')
@@ -57,10 +62,12 @@ class Config:
     FETCH_ARCHIVED = os.getenv('FETCH_ARCHIVED', 'false').lower() == 'true'
     MAX_EVENTS_PER_RUN = int(os.getenv('MAX_EVENTS_PER_RUN', '5000'))
     MAX_MARKETS_PER_EVENT = int(os.getenv('MAX_MARKETS_PER_EVENT', '100'))
+    MARKETS_FRESH_MINUTES = int(os.getenv('MARKETS_FRESH_MINUTES', '30'))  # Skip events whose markets were fetched this recently
     
     # Comments Configuration
     MAX_COMMENTS_PER_EVENT = int(os.getenv('MAX_COMMENTS_PER_EVENT', '50'))
     FETCH_COMMENT_REACTIONS = os.getenv('FETCH_COMMENT_REACTIONS', 'true').lower() == 'true'
+    COMMENTS_EMPTY_TTL_HOURS = int(os.getenv('COMMENTS_EMPTY_TTL_HOURS', '24'))  # Skip entities with no comments for N hours
     
     # Feature Flags - All enabled by default
     FETCH_EVENTS = os.getenv('FETCH_EVENTS', 'true').lower() == 'true'
@@ -82,6 +89,7 @@ class Config:
     MIN_WHALE_WALLET = float(os.getenv('MIN_WHALE_WALLET', '10000'))  # $10k minimum wallet
     MIN_WHALE_TRADE = float(os.getenv('MIN_WHALE_TRADE', '10000'))  # $10k minimum trade
     MIN_POSITION_VALUE = float(os.getenv('MIN_POSITION_VALUE', '500'))  # $500 minimum position
+    WALLET_VALUE_TTL_SECONDS = int(os.getenv('WALLET_VALUE_TTL_SECONDS', '1800'))  # Reuse fetched wallet values for N seconds
     
     # User and Transaction Limits
     INITIAL_USERS_PER_EVENT = int(os.getenv('INITIAL_USERS_PER_EVENT', '100'))
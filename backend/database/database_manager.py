@@ -7,9 +7,12 @@ Handles all database operations with SQLite
 import sqlite3
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from queue import Queue, Empty
+from time import monotonic
+from typing import Callable, Dict, Iterator, List, Any, Optional
 import sys
 
 # Add parent directory to path
@@ -17,6 +20,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.config import Config
 
+# SQLite's host-parameter limit (SQLITE_MAX_VARIABLE_NUMBER), raised from 999 in 3.32
+_MAX_SQL_PARAMS = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
 class DatabaseManager:
     """Manager for all database operations"""
     
@@ -26,6 +32,9 @@ class DatabaseManager:
         self.config = Config
         self.logger = self._setup_logger()
         
+        # Per-thread read connections, opened lazily by _read_connection
+        self._local = threading.local()
+        
         # Ensure database directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         
@@ -49,36 +58,53 @@ class DatabaseManager:
     
     def get_connection(self):
         """Get database connection with proper settings"""
+        # Larger statement cache so long-lived per-thread read connections keep
+        # the many distinct SELECTs used across managers prepared between calls
         conn = sqlite3.connect(
             self.db_path, 
             timeout=30.0,
-            check_same_thread=False
+            check_same_thread=False,
+            cached_statements=512
         )
         conn.row_factory = sqlite3.Row
         
-        # Set optimal pragmas
+        # Set optimal pragmas (journal_mode is persistent and set once in initialize_schema)
         conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
         conn.execute("PRAGMA synchronous = NORMAL")
         conn.execute("PRAGMA cache_size = -64000")
         conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
         
         return conn
     
+    def _read_connection(self):
+        """Get this thread's cached read connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.get_connection()
+            self._local.conn = conn
+        return conn
+    
     def close_connection(self):
-        """Close database connection - for compatibility with managers that expect this method"""
-        # SQLite connections in this implementation are closed after each operation
-        pass
+        """Close the calling thread's cached read connection"""
+        # Write connections are still opened and closed around each operation
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
     
     def initialize_schema(self):
         """Initialize database schema from database_schema.py"""
         try:
             # Import the schema
-            from backend.database.database_schema import get_schema
+            from backend.database.database_schema import get_schema, get_added_columns, get_dropped_indexes
             
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            # WAL is stored in the database file, so every later connection inherits it
+            cursor.execute("PRAGMA journal_mode = WAL")
+            
             # Get the full schema
             schema_sql = get_schema()
             
@@ -96,6 +122,20 @@ class DatabaseManager:
                         if "already exists" not in str(e).lower():
                             errors.append(str(e))
             
+            # Bring tables created by older versions up to the current columns
+            for table, columns in get_added_columns().items():
+                existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+                for column, definition in columns:
+                    if existing and column not in existing:
+                        try:
+                            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                        except sqlite3.Error as e:
+                            errors.append(str(e))
+            
+            # Drop superseded indexes so they stop adding write cost
+            for index in get_dropped_indexes():
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+            
             conn.commit()
             conn.close()
             
@@ -347,11 +387,48 @@ class DatabaseManager:
         finally:
             conn.close()
     
-    def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
-        """Fetch single row as dictionary"""
+    def bulk_write(self, writes: List[tuple]) -> int:
+        """
+        Write several record batches in a single transaction
+        
+        Args:
+            writes: List of (table, records, conflict) tuples, where conflict is
+                    'REPLACE' or 'IGNORE' and records share the keys of the first record.
+                    (table, records, 'UPDATE', key) upserts on the key column instead,
+                    so columns missing from the records keep their stored values
+        
+        Returns:
+            Total affected rows
+        """
+        writes = [write for write in writes if write[1]]
+        if not writes:
+            return 0
+        
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            total_written = 0
+            
+            for table, records, conflict, *key in writes:
+                columns = list(records[0].keys())
+                rows = [tuple(record.get(col) for col in columns) for record in records]
+                total_written += self._insert_rows(cursor, conflict, table, columns, rows, key=key[0] if key else None)
+            
+            conn.commit()
+            return total_written
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"Bulk write error: {e}")
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
+        """Fetch single row as dictionary"""
+        cursor = self._read_connection().cursor()
+        try:
             if params:
                 cursor.execute(query, params)
             else:
@@ -362,13 +439,13 @@ class DatabaseManager:
             self.logger.error(f"Fetch error: {e}")
             raise
         finally:
-            conn.close()
+            # Finalize the statement so no read snapshot stays open on the cached connection
+            cursor.close()
     
     def fetch_all(self, query: str, params: tuple = None) -> List[Dict]:
         """Fetch all rows as list of dictionaries"""
-        conn = self.get_connection()
+        cursor = self._read_connection().cursor()
         try:
-            cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
             else:
@@ -379,7 +456,32 @@ class DatabaseManager:
             self.logger.error(f"Fetch all error: {e}")
             raise
         finally:
-            conn.close()
+            cursor.close()
+    
+    def fetch_iter(self, query: str, params: tuple = None, key: str = 'id', page_size: int = 500) -> Iterator[Dict]:
+        """
+        Lazily yield rows as dictionaries, one keyset page at a time, ordered by key
+        
+        Each page is a separate short read whose cursor is closed before its rows are
+        yielded, so a slow consumer never holds a read transaction open (which would pin
+        the WAL snapshot and stop checkpoints while writers keep committing)
+        
+        Args:
+            query: SELECT returning the key column (no ORDER BY/LIMIT; pages are ordered by key)
+            params: Parameters for query
+            key: Unique column to page on
+            page_size: Rows read per page
+        """
+        first_page = f"SELECT * FROM ({query}) ORDER BY {key} LIMIT ?"
+        next_page = f"SELECT * FROM ({query}) WHERE {key} > ? ORDER BY {key} LIMIT ?"
+        params = tuple(params or ())
+        
+        rows = self.fetch_all(first_page, params + (page_size,))
+        while rows:
+            yield from rows
+            if len(rows) < page_size:
+                break
+            rows = self.fetch_all(next_page, params + (rows[-1][key], page_size))
     
     def insert(self, table: str, data: Dict) -> int:
         """Insert single record"""
@@ -462,73 +564,81 @@ class DatabaseManager:
         
         return self.executemany(query, params_list)
     
-    def bulk_insert_or_replace(self, table: str, data: List[Dict], batch_size: int = 1000) -> int:
-        """Bulk insert or replace records in batches"""
-        if not data:
-            return 0
+    def _insert_rows(self, cursor, conflict: str, table: str, columns: List[str],
+                     rows: List[tuple], batch_size: int = 1000, key: Optional[str] = None) -> int:
+        """
+        Insert row tuples with multi-row INSERT OR <conflict> statements
         
-        # Get columns from first record
-        columns = list(data[0].keys())
-        placeholders = ','.join(['?' for _ in columns])
-        columns_str = ','.join(columns)
+        Up to batch_size rows (capped by SQLite's parameter limit) are packed into each
+        statement, so SQLite parses and dispatches once per chunk rather than once per row.
+        With conflict 'UPDATE', rows that collide on key update only the given columns
         
-        query = f"INSERT OR REPLACE INTO {table} ({columns_str}) VALUES ({placeholders})"
+        Returns:
+            Total affected rows
+        """
+        rows_per_statement = max(1, min(batch_size, _MAX_SQL_PARAMS // len(columns)))
+        prefix = f"INSERT OR {conflict} INTO {table} ({','.join(columns)}) VALUES "
+        suffix = ''
+        if conflict == 'UPDATE':
+            prefix = f"INSERT INTO {table} ({','.join(columns)}) VALUES "
+            updates = ','.join(f"{col}=excluded.{col}" for col in columns if col != key)
+            suffix = f" ON CONFLICT({key}) DO UPDATE SET {updates}"
+        row_placeholders = f"({','.join('?' for _ in columns)})"
+        full_query = None
+        total_inserted = 0
         
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            total_inserted = 0
-            
-            # Process in batches
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i + batch_size]
-                params_list = []
-                for record in batch:
-                    values = [record.get(col) for col in columns]
-                    params_list.append(tuple(values))
-                
-                cursor.executemany(query, params_list)
-                total_inserted += cursor.rowcount
-                conn.commit()
-            
-            return total_inserted
+        for i in range(0, len(rows), rows_per_statement):
+            chunk = rows[i:i + rows_per_statement]
+            if len(chunk) == rows_per_statement:
+                if full_query is None:
+                    full_query = prefix + ','.join([row_placeholders] * rows_per_statement) + suffix
+                query = full_query
+            else:
+                query = prefix + ','.join([row_placeholders] * len(chunk)) + suffix
             
-        except sqlite3.Error as e:
-            self.logger.error(f"Bulk insert error in {table}: {e}")
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            cursor.execute(query, [value for row in chunk for value in row])
+            total_inserted += cursor.rowcount
+        
+        return total_inserted
     
-    def bulk_insert_or_ignore(self, table: str, data: List[Dict], batch_size: int = 1000) -> int:
-        """Bulk insert records, ignoring duplicates, in batches"""
+    def _bulk_insert_with_conflict(self, table: str, data: List[Dict], conflict: str, batch_size: int) -> int:
+        """Bulk insert records with INSERT OR <conflict>, committed as a single transaction"""
         if not data:
             return 0
         
         # Get columns from first record
         columns = list(data[0].keys())
-        placeholders = ','.join(['?' for _ in columns])
-        columns_str = ','.join(columns)
+        rows = [tuple(record.get(col) for col in columns) for record in data]
         
-        query = f"INSERT OR IGNORE INTO {table} ({columns_str}) VALUES ({placeholders})"
+        return self.bulk_insert_rows(table, columns, rows, conflict, batch_size)
+    
+    def bulk_insert_rows(self, table: str, columns: List[str], rows: List[tuple],
+                         conflict: str = 'IGNORE', batch_size: int = 1000) -> int:
+        """
+        Bulk insert pre-built row tuples with INSERT OR <conflict>, committed as a single transaction
+        
+        Lets callers skip building a dict per record when they already know the column order
+        
+        Args:
+            table: Target table
+            columns: Column names, in the order of each row tuple
+            rows: Row tuples
+            conflict: 'REPLACE' or 'IGNORE'
+            batch_size: Rows packed into each multi-row INSERT
+        
+        Returns:
+            Total affected rows
+        """
+        if not rows:
+            return 0
         
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
-            total_inserted = 0
-            
-            # Process in batches
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i + batch_size]
-                params_list = []
-                for record in batch:
-                    values = [record.get(col) for col in columns]
-                    params_list.append(tuple(values))
-                
-                cursor.executemany(query, params_list)
-                total_inserted += cursor.rowcount
-                conn.commit()
+            total_inserted = self._insert_rows(cursor, conflict, table, columns, rows, batch_size)
             
+            # One transaction for the whole call rather than a commit per batch
+            conn.commit()
             return total_inserted
             
         except sqlite3.Error as e:
@@ -538,6 +648,47 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def bulk_insert_or_replace(self, table: str, data: List[Dict], batch_size: int = 1000) -> int:
+        """Bulk insert or replace records in multi-row batches, committed as a single transaction"""
+        return self._bulk_insert_with_conflict(table, data, 'REPLACE', batch_size)
+    
+    def bulk_insert_or_ignore(self, table: str, data: List[Dict], batch_size: int = 1000) -> int:
+        """Bulk insert records, ignoring duplicates, in multi-row batches committed as a single transaction"""
+        return self._bulk_insert_with_conflict(table, data, 'IGNORE', batch_size)
+    
+    def _drain_and_insert(self, row_queue: Queue, insert: Callable[[List], None], max_batch: int, max_wait: float):
+        """
+        Insert queued rows whenever max_batch rows are pending or
+        max_wait seconds have passed since the last flush, until the None sentinel
+        
+        Args:
+            row_queue: Queue of row lists
+            insert: Bulk insert applied to each flushed chunk
+            max_batch: Rows that trigger an immediate flush
+            max_wait: Longest time (seconds) pending rows wait before being flushed
+        """
+        pending = []
+        last_flush = monotonic()
+        running = True
+        
+        while running:
+            try:
+                rows = row_queue.get(timeout=max_wait)
+                if rows is None:
+                    running = False
+                else:
+                    pending.extend(rows)
+            except Empty:
+                pass
+            
+            if pending and (len(pending) >= max_batch or not running or monotonic() - last_flush >= max_wait):
+                try:
+                    insert(pending)
+                except Exception as e:
+                    self.logger.error(f"Error inserting {len(pending)} rows: {e}")
+                pending = []
+                last_flush = monotonic()
+    
     def delete_records(self, table: str, where_clause: str = None, params: tuple = None, commit: bool = True) -> int:
         """Delete records from a table"""
         conn = self.get_connection()
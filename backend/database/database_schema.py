@@ -341,7 +341,7 @@ def get_schema():
         created_at TEXT,
         updated_at TEXT,
         fetched_at TEXT
-    );
+    ) WITHOUT ROWID;
 
     -- Event creators table
     CREATE TABLE IF NOT EXISTS event_creators (
@@ -444,8 +444,16 @@ def get_schema():
     CREATE TABLE IF NOT EXISTS market_holders (
         market_id TEXT,
         proxy_wallet TEXT,
+        token_id TEXT,
+        username TEXT,
+        pseudonym TEXT,
+        amount REAL DEFAULT 0,
+        outcome_index INTEGER,
+        bio TEXT,
+        profile_image TEXT,
         shares REAL DEFAULT 0,
         avg_price REAL DEFAULT 0,
+        updated_at TEXT,
         PRIMARY KEY (market_id, proxy_wallet),
         FOREIGN KEY (market_id) REFERENCES markets(id) ON DELETE CASCADE
     );
@@ -461,7 +469,7 @@ def get_schema():
         PRIMARY KEY (event_id, tag_id),
         FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
         -- Note: FK on tag_id removed - tags may not exist when events are loaded
-    );
+    ) WITHOUT ROWID;
 
     -- Market tags relationship table
     CREATE TABLE IF NOT EXISTS market_tags (
@@ -591,6 +599,14 @@ def get_schema():
         PRIMARY KEY (comment_id, user_id, reaction_type),
         FOREIGN KEY (comment_id) REFERENCES comments(id) ON DELETE CASCADE
     );
+
+    -- Events/markets whose last comments fetch came back empty
+    CREATE TABLE IF NOT EXISTS comment_empty_entities (
+        entity_type TEXT,
+        entity_id TEXT,
+        checked_at TEXT,
+        PRIMARY KEY (entity_type, entity_id)
+    );
     """
     
     # User activity tables
@@ -740,6 +756,7 @@ def get_schema():
     CREATE INDEX IF NOT EXISTS idx_markets_condition ON markets(condition_id);
     CREATE INDEX IF NOT EXISTS idx_markets_volume ON markets(volume_num DESC);
     CREATE INDEX IF NOT EXISTS idx_markets_active ON markets(active);
+    CREATE INDEX IF NOT EXISTS idx_markets_active_volume ON markets(active, volume DESC);
 
     CREATE INDEX IF NOT EXISTS idx_series_volume ON series(volume DESC);
     CREATE INDEX IF NOT EXISTS idx_series_slug ON series(slug);
@@ -765,7 +782,7 @@ def get_schema():
 
     CREATE INDEX IF NOT EXISTS idx_activity_wallet ON user_activity(proxy_wallet);
     CREATE INDEX IF NOT EXISTS idx_activity_timestamp ON user_activity(timestamp DESC);
-    CREATE INDEX IF NOT EXISTS idx_activity_size ON user_activity(usdc_size DESC);
+    CREATE INDEX IF NOT EXISTS idx_activity_size_ts ON user_activity(usdc_size DESC, timestamp DESC);
 
     CREATE INDEX IF NOT EXISTS idx_trades_wallet ON user_trades(proxy_wallet);
     CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON user_trades(timestamp DESC);
@@ -805,5 +822,38 @@ def get_schema():
     
     return full_schema
 
+def get_added_columns():
+    """
+    Columns added to existing tables after their first release
+    CREATE TABLE IF NOT EXISTS leaves older databases untouched, so these are
+    added with ALTER TABLE when missing
+    
+    Returns:
+        Dict of table name -> list of (column name, column definition)
+    """
+    return {
+        'market_holders': [
+            ('token_id', 'TEXT'),
+            ('username', 'TEXT'),
+            ('pseudonym', 'TEXT'),
+            ('amount', 'REAL DEFAULT 0'),
+            ('outcome_index', 'INTEGER'),
+            ('bio', 'TEXT'),
+            ('profile_image', 'TEXT'),
+            ('updated_at', 'TEXT'),
+        ],
+    }
+
+def get_dropped_indexes():
+    """
+    Indexes replaced by newer ones and dropped from existing databases
+    
+    Returns:
+        List of index names
+    """
+    return [
+        'idx_activity_size',  # superseded by idx_activity_size_ts
+    ]
+
 # For backward compatibility
 SCHEMA = get_schema()
\ No newline at end of file
@@ -5,7 +5,7 @@ Handles storage functionality for comments data
 
 from datetime import datetime
 from threading import Lock
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from backend.database.database_manager import DatabaseManager
 
 class StoreCommentsManager(DatabaseManager):
@@ -21,51 +21,64 @@ class StoreCommentsManager(DatabaseManager):
 
     def _store_comments(self, comments: List[Dict], event_id: str = None, market_id: str = None):
         """
-        Store comments in database (thread-safe)
+        Store comments and their author profiles in one transaction (thread-safe)
         
         Args:
             comments: List of comment dictionaries
             event_id: Event ID if comments are for an event
             market_id: Market ID if comments are for a market
         """
-        comment_records = []
+        self._store_comments_bulk([(event_id, market_id, comments)])
 
-        for comment in comments:
-            # Extract profile data
-            profile = comment.get('profile', {})
+    def _store_comments_bulk(self, comments_by_entity: List[Tuple[str, str, List[Dict]]]):
+        """
+        Store comments for several events/markets and their author profiles in one transaction (thread-safe)
+        
+        Args:
+            comments_by_entity: List of (event_id, market_id, comments) tuples
+        """
+        comment_records = []
+        user_records = {}
+        now = datetime.now().isoformat()
 
-            record = {
-                'id': comment.get('id'),
-                'event_id': event_id,
-                'market_id': market_id,
-                'proxy_wallet': comment.get('userAddress') or profile.get('proxyWallet'),
-                'username': profile.get('name') or profile.get('pseudonym'),
-                'profile_image': profile.get('profileImage'),
-                'content': comment.get('body'),
-                'parent_comment_id': comment.get('parentCommentID'),
-                'created_at': comment.get('createdAt'),
-                'updated_at': comment.get('updatedAt'),
-                'likes_count': comment.get('reactionCount', 0),
-                'replies_count': 0  # Can be computed later if needed
-            }
-            comment_records.append(record)
+        for event_id, market_id, comments in comments_by_entity:
+            for comment in comments:
+                # Extract profile data
+                profile = comment.get('profile', {})
 
-            # Store user profile if we have it
-            if profile and profile.get('proxyWallet'):
-                user_record = {
-                    'proxy_wallet': profile.get('proxyWallet'),
+                record = {
+                    'id': comment.get('id'),
+                    'event_id': event_id,
+                    'market_id': market_id,
+                    'proxy_wallet': comment.get('userAddress') or profile.get('proxyWallet'),
                     'username': profile.get('name') or profile.get('pseudonym'),
-                    'bio': profile.get('bio'),
                     'profile_image': profile.get('profileImage'),
-                    'last_updated': datetime.now().isoformat()
+                    'content': comment.get('body'),
+                    'parent_comment_id': comment.get('parentCommentID'),
+                    'created_at': comment.get('createdAt'),
+                    'updated_at': comment.get('updatedAt'),
+                    'likes_count': comment.get('reactionCount', 0),
+                    'replies_count': 0  # Can be computed later if needed
                 }
-                with self._db_lock:
-                    self.insert_or_ignore('users', user_record)
+                comment_records.append(record)
+
+                # Store user profile if we have it
+                if profile and profile.get('proxyWallet'):
+                    user_records.setdefault(profile.get('proxyWallet'), {
+                        'proxy_wallet': profile.get('proxyWallet'),
+                        'username': profile.get('name') or profile.get('pseudonym'),
+                        'bio': profile.get('bio'),
+                        'profile_image': profile.get('profileImage'),
+                        'last_updated': now
+                    })
 
         if comment_records:
             with self._db_lock:
-                self.bulk_insert_or_replace('comments', comment_records)
-                self.logger.debug(f"Stored {len(comment_records)} comments")
+                self.bulk_write([
+                    ('users', list(user_records.values()), 'IGNORE'),
+                    ('comments', comment_records, 'REPLACE')
+                ])
+                self.logger.debug("Stored %d comments for %d entities", len(comment_records), len(comments_by_entity))
 
     def _store_comment_reactions(self, comment_id: str, reactions: List[Dict]):
         """
@@ -75,35 +88,48 @@ class StoreCommentsManager(DatabaseManager):
             comment_id: ID of the comment
             reactions: List of reaction dictionaries
         """
-        reaction_records = []
+        self._store_comment_reactions_bulk([(comment_id, reactions)])
 
-        for reaction in reactions:
-            # Extract profile data
-            profile = reaction.get('profile', {})
+    def _store_comment_reactions_bulk(self, reactions_by_comment: List[Tuple[str, List[Dict]]]):
+        """
+        Store reactions for several comments in one transaction (thread-safe)
+        
+        Args:
+            reactions_by_comment: List of (comment_id, reactions) tuples
+        """
+        reaction_records = []
+        user_records = {}
+        now = datetime.now().isoformat()
 
-            record = {
-                'comment_id': comment_id,
-                'proxy_wallet': reaction.get('userAddress') or profile.get('proxyWallet'),
-                'reaction_type': reaction.get('reactionType', 'LIKE'),
-                'created_at': reaction.get('createdAt') or datetime.now().isoformat()
-            }
-            reaction_records.append(record)
+        for comment_id, reactions in reactions_by_comment:
+            for reaction in reactions:
+                # Extract profile data
+                profile = reaction.get('profile', {})
 
-            # Store user profile if we have it
-            if profile and profile.get('proxyWallet'):
-                user_record = {
-                    'proxy_wallet': profile.get('proxyWallet'),
-                    'username': profile.get('name') or profile.get('pseudonym'),
-                    'profile_image': profile.get('profileImage'),
-                    'last_updated': datetime.now().isoformat()
+                record = {
+                    'comment_id': comment_id,
+                    'proxy_wallet': reaction.get('userAddress') or profile.get('proxyWallet'),
+                    'reaction_type': reaction.get('reactionType', 'LIKE'),
+                    'created_at': reaction.get('createdAt') or now
                 }
-                with self._db_lock:
-                    self.insert_or_ignore('users', user_record)
+                reaction_records.append(record)
+
+                # Store user profile if we have it
+                if profile and profile.get('proxyWallet'):
+                    user_records.setdefault(profile.get('proxyWallet'), {
+                        'proxy_wallet': profile.get('proxyWallet'),
+                        'username': profile.get('name') or profile.get('pseudonym'),
+                        'profile_image': profile.get('profileImage'),
+                        'last_updated': now
+                    })
 
         if reaction_records:
             with self._db_lock:
-                self.bulk_insert_or_replace('comment_reactions', reaction_records)
-                self.logger.debug(f"Stored {len(reaction_records)} reactions for comment {comment_id}")
+                self.bulk_write([
+                    ('users', list(user_records.values()), 'IGNORE'),
+                    ('comment_reactions', reaction_records, 'REPLACE')
+                ])
+                self.logger.debug("Stored %d reactions for %d comments", len(reaction_records), len(reactions_by_comment))
 
     def _store_user_comments(self, comments: List[Dict]):
         """
@@ -131,4 +157,4 @@ class StoreCommentsManager(DatabaseManager):
         if comment_records:
             with self._db_lock:
                 self.bulk_insert_or_replace('comments', comment_records)
-                self.logger.debug(f"Stored {len(comment_records)} user comments")
\ No newline at end of file
+                self.logger.debug("Stored %d user comments", len(comment_records))
\ No newline at end of file
@@ -6,7 +6,7 @@ Handles comprehensive storage functionality for markets data and all related tab
 from datetime import datetime
 import json
 from threading import Lock
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from backend.database.database_manager import DatabaseManager
 
 class StoreMarketsManager(DatabaseManager):
@@ -24,48 +24,51 @@ class StoreMarketsManager(DatabaseManager):
         """
         Store multiple markets in the database (thread-safe)
         """
+        self._store_markets_bulk([(event_id, markets)])
+
+    def _store_markets_bulk(self, markets_by_event: List[Tuple[str, List[Dict]]]):
+        """
+        Store the markets of several events with one bulk insert per table (thread-safe)
+        
+        Args:
+            markets_by_event: List of (event_id, markets) tuples
+        """
         market_records = []
         market_tags_to_store = []
         market_categories_to_store = []
         image_optimized_to_store = []
         
-        for market in markets:
-            market_record = self._prepare_market_record(market, event_id)
-            market_records.append(market_record)
-            
-            # Collect tags for this market
-            if 'tags' in market and market['tags']:
-                for tag in market['tags']:
-                    market_tags_to_store.append((market['id'], tag))
-            
-            # Collect categories for this market
-            if 'categories' in market and market['categories']:
-                for category in market['categories']:
-                    market_categories_to_store.append((market['id'], category))
-            
-            # Collect image optimization data
-            if 'imageOptimized' in market and market['imageOptimized']:
-                image_optimized_to_store.append((market['id'], market['imageOptimized'], 'image'))
-            if 'iconOptimized' in market and market['iconOptimized']:
-                image_optimized_to_store.append((market['id'], market['iconOptimized'], 'icon'))
-        
-        if market_records:
-            with self._db_lock:
-                # Store markets
-                self.bulk_insert_or_replace('markets', market_records)
-                self.logger.debug(f"Stored {len(market_records)} markets for event {event_id}")
+        for event_id, markets in markets_by_event:
+            for market in markets:
+                market_record = self._prepare_market_record(market, event_id)
+                market_records.append(market_record)
                 
-                # Store tags
-                if market_tags_to_store:
-                    self._store_market_tags_batch(market_tags_to_store)
+                # Collect tags for this market
+                if 'tags' in market and market['tags']:
+                    for tag in market['tags']:
+                        market_tags_to_store.append((market['id'], tag))
                 
-                # Store categories
-                if market_categories_to_store:
-                    self._store_market_categories_batch(market_categories_to_store)
+                # Collect categories for this market
+                if 'categories' in market and market['categories']:
+                    for category in market['categories']:
+                        market_categories_to_store.append((market['id'], category))
                 
-                # Store image optimization data
-                if image_optimized_to_store:
-                    self._store_image_optimized_batch(image_optimized_to_store)
+                # Collect image optimization data
+                if 'imageOptimized' in market and market['imageOptimized']:
+                    image_optimized_to_store.append((market['id'], market['imageOptimized'], 'image'))
+                if 'iconOptimized' in market and market['iconOptimized']:
+                    image_optimized_to_store.append((market['id'], market['iconOptimized'], 'icon'))
+        
+        if market_records:
+            # Markets, tags, categories and images are written in one transaction
+            writes = [('markets', market_records, 'REPLACE')]
+            writes += self._market_tag_writes(market_tags_to_store)
+            writes += self._market_category_writes(market_categories_to_store)
+            writes += self._image_optimized_writes(image_optimized_to_store)
+            
+            with self._db_lock:
+                self.bulk_write(writes)
+                self.logger.debug(f"Stored {len(market_records)} markets for {len(markets_by_event)} events")
 
     def _store_market_detailed(self, market: Dict):
         """
@@ -245,6 +248,10 @@ class StoreMarketsManager(DatabaseManager):
 
     def _store_market_tags_batch(self, market_tags: List[tuple]):
         """Store market tags in batch"""
+        self.bulk_write(self._market_tag_writes(market_tags))
+
+    def _market_tag_writes(self, market_tags: List[tuple]) -> List[tuple]:
+        """Build bulk_write entries for tags and market-tag relationships"""
         tag_records = []
         market_tag_records = []
         
@@ -283,16 +290,15 @@ class StoreMarketsManager(DatabaseManager):
                     'tag_slug': tag_slug
                 })
         
-        # Insert tags first
-        if tag_records:
-            self.bulk_insert_or_ignore('tags', tag_records)
-        
-        # Then insert relationships
-        if market_tag_records:
-            self.bulk_insert_or_ignore('market_tags', market_tag_records)
+        # Tags first, then relationships
+        return [('tags', tag_records, 'IGNORE'), ('market_tags', market_tag_records, 'IGNORE')]
 
     def _store_market_categories_batch(self, market_categories: List[tuple]):
         """Store market categories in batch"""
+        self.bulk_write(self._market_category_writes(market_categories))
+
+    def _market_category_writes(self, market_categories: List[tuple]) -> List[tuple]:
+        """Build bulk_write entries for categories and market-category relationships"""
         category_records = []
         market_category_records = []
         
@@ -320,16 +326,16 @@ class StoreMarketsManager(DatabaseManager):
                         'category_id': cat_id
                     })
         
-        # Insert categories first
-        if category_records:
-            self.bulk_insert_or_ignore('categories', category_records)
-        
-        # Then insert relationships
-        if market_category_records:
-            self.bulk_insert_or_ignore('market_categories', market_category_records)
+        # Categories first, then relationships
+        return [('categories', category_records, 'IGNORE'),
+                ('market_categories', market_category_records, 'IGNORE')]
 
     def _store_image_optimized_batch(self, image_data: List[tuple]):
         """Store image optimization data in batch"""
+        self.bulk_write(self._image_optimized_writes(image_data))
+
+    def _image_optimized_writes(self, image_data: List[tuple]) -> List[tuple]:
+        """Build the bulk_write entry for image optimization records"""
         image_records = []
         
         for market_id, img_data, field_type in image_data:
@@ -349,8 +355,7 @@ class StoreMarketsManager(DatabaseManager):
                     'entity_id': market_id
                 })
         
-        if image_records:
-            self.bulk_insert_or_ignore('image_optimized', image_records)
+        return [('image_optimized', image_records, 'IGNORE')]
 
     def _store_image_optimized_single(self, market_id: str, img_data: Dict, field_type: str):
         """Store single image optimization record"""
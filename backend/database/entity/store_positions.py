@@ -8,6 +8,17 @@ from threading import Lock
 from typing import Dict, List
 from backend.database.database_manager import DatabaseManager
 
+# Column order of the tuples built by StorePositionsManager._current_position_row
+CURRENT_POSITION_COLUMNS = (
+    'proxy_wallet', 'asset', 'condition_id', 'size', 'avg_price',
+    'initial_value', 'current_value', 'cash_pnl', 'percent_pnl',
+    'total_bought', 'realized_pnl', 'percent_realized_pnl', 'cur_price',
+    'redeemable', 'mergeable', 'negative_risk', 'title', 'slug',
+    'icon', 'event_id', 'event_slug', 'outcome', 'outcome_index',
+    'opposite_outcome', 'opposite_asset', 'end_date', 'updated_at'
+)
+
+
 class StorePositionsManager(DatabaseManager):
     """Manager for storing position data with thread-safe operations"""
 
@@ -120,48 +131,36 @@ class StorePositionsManager(DatabaseManager):
         
         with self._db_lock:
             self.bulk_insert_or_ignore('user_positions_closed', position_data, batch_size=100)
-            self.logger.info(f"Bulk inserted {len(position_data)} closed positions")
+            self.logger.debug(f"Bulk inserted {len(position_data)} closed positions")
 
     def _bulk_insert_positions(self, positions: List[Dict]):
         """Bulk insert current positions into database (thread-safe)"""
         if not positions:
             return
         
-        # Prepare data for bulk insert
-        position_data = []
-        
-        for position in positions:
-            position_data.append({
-                'proxy_wallet': position.get('proxyWallet'),
-                'asset': position.get('asset'),
-                'condition_id': position.get('conditionId'),
-                'size': position.get('size'),
-                'avg_price': position.get('avgPrice'),
-                'initial_value': position.get('initialValue'),
-                'current_value': position.get('currentValue'),
-                'cash_pnl': position.get('cashPnl'),
-                'percent_pnl': position.get('percentPnl'),
-                'total_bought': position.get('totalBought'),
-                'realized_pnl': position.get('realizedPnl'),
-                'percent_realized_pnl': position.get('percentRealizedPnl'),
-                'cur_price': position.get('curPrice'),
-                'redeemable': position.get('redeemable'),
-                'mergeable': position.get('mergeable'),
-                'negative_risk': position.get('negativeRisk'),
-                'title': position.get('title'),
-                'slug': position.get('slug'),
-                'icon': position.get('icon'),
-                'event_id': position.get('eventId'),
-                'event_slug': position.get('eventSlug'),
-                'outcome': position.get('outcome'),
-                'outcome_index': position.get('outcomeIndex'),
-                'opposite_outcome': position.get('oppositeOutcome'),
-                'opposite_asset': position.get('oppositeAsset'),
-                'end_date': position.get('endDate'),
-                'updated_at': datetime.now().isoformat()
-            })
+        updated_at = datetime.now().isoformat()
+        self._bulk_insert_position_rows([
+            self._current_position_row(position, position.get('proxyWallet'), updated_at)
+            for position in positions
+        ])
+
+    def _current_position_row(self, position: Dict, proxy_wallet: str, updated_at: str) -> tuple:
+        """Build a user_positions_current row in CURRENT_POSITION_COLUMNS order"""
+        get = position.get
+        return (
+            proxy_wallet, get('asset'), get('conditionId'), get('size'), get('avgPrice'),
+            get('initialValue'), get('currentValue'), get('cashPnl'), get('percentPnl'),
+            get('totalBought'), get('realizedPnl'), get('percentRealizedPnl'), get('curPrice'),
+            get('redeemable'), get('mergeable'), get('negativeRisk'), get('title'), get('slug'),
+            get('icon'), get('eventId'), get('eventSlug'), get('outcome'), get('outcomeIndex'),
+            get('oppositeOutcome'), get('oppositeAsset'), get('endDate'), updated_at
+        )
+
+    def _bulk_insert_position_rows(self, rows: List[tuple]):
+        """Bulk insert current position rows built by _current_position_row in one transaction (thread-safe)"""
+        if not rows:
+            return
         
-        # Bulk insert
         with self._db_lock:
-            self.bulk_insert_or_replace('user_positions_current', position_data, batch_size=100)
-            self.logger.info(f"Bulk inserted {len(position_data)} positions")
\ No newline at end of file
+            self.bulk_insert_rows('user_positions_current', CURRENT_POSITION_COLUMNS, rows, 'REPLACE', batch_size=500)
+            self.logger.debug(f"Bulk inserted {len(rows)} positions")
@@ -27,6 +27,10 @@ class StoreTagsManager(DatabaseManager):
         tag_records = []
         
         for tag in tags:
+            # tags is WITHOUT ROWID, so a NULL id would abort the whole batch
+            if not tag.get('id'):
+                continue
+            
             record = {
                 'id': tag.get('id'),
                 'label': tag.get('label'),
@@ -104,6 +108,7 @@ class StoreTagsManager(DatabaseManager):
         
         tag_records = []
         event_tag_records = []
+        now = datetime.now().isoformat()
         
         for tag in tags:
             if isinstance(tag, dict):
@@ -125,8 +130,8 @@ class StoreTagsManager(DatabaseManager):
                     'force_show': tag.get('forceShow', False) if isinstance(tag, dict) else False,
                     'is_carousel': tag.get('isCarousel', False) if isinstance(tag, dict) else False,
                     'published_at': tag.get('publishedAt') if isinstance(tag, dict) else None,
-                    'created_at': tag.get('createdAt') if isinstance(tag, dict) else datetime.now().isoformat(),
-                    'updated_at': tag.get('updatedAt') if isinstance(tag, dict) else datetime.now().isoformat()
+                    'created_at': tag.get('createdAt') if isinstance(tag, dict) else now,
+                    'updated_at': tag.get('updatedAt') if isinstance(tag, dict) else now
                 }
                 tag_records.append(tag_record)
                 
@@ -137,13 +142,12 @@ class StoreTagsManager(DatabaseManager):
                     'tag_slug': tag_slug
                 })
         
-        if tag_records:
-            with self._db_lock:
-                self.bulk_insert_or_ignore('tags', tag_records)
-        
-        if event_tag_records:
-            with self._db_lock:
-                self.bulk_insert_or_ignore('event_tags', event_tag_records)
+        # Tags and their event links go in one transaction
+        with self._db_lock:
+            self.bulk_write([
+                ('tags', tag_records, 'IGNORE'),
+                ('event_tags', event_tag_records, 'IGNORE')
+            ])
 
     def _fetch_and_store_event_tags(self, event_id: str, tags: List[Dict]):
         """
@@ -156,6 +160,9 @@ class StoreTagsManager(DatabaseManager):
         event_tag_records = []
         
         for tag in tags:
+            if not tag.get('id'):
+                continue
+            
             tag_record = {
                 'id': tag.get('id'),
                 'label': tag.get('label'),
@@ -179,15 +186,12 @@ class StoreTagsManager(DatabaseManager):
                 'tag_slug': tag.get('slug')
             })
         
-        # Bulk insert tags
-        if tag_records:
-            with self._db_lock:
-                self.bulk_insert_or_replace('tags', tag_records)
-        
-        # Store event-tag relationships
-        if event_tag_records:
-            with self._db_lock:
-                self.bulk_insert_or_replace('event_tags', event_tag_records)
+        # Tags and event-tag relationships in a single transaction
+        with self._db_lock:
+            self.bulk_write([
+                ('tags', tag_records, 'REPLACE'),
+                ('event_tags', event_tag_records, 'REPLACE')
+            ])
         
         self.logger.debug(f"Stored {len(tags)} tags for event {event_id}")
 
@@ -200,6 +204,7 @@ class StoreTagsManager(DatabaseManager):
         
         tag_records = []
         market_tag_records = []
+        now = datetime.now().isoformat()
         
         for tag in tags:
             if isinstance(tag, dict):
@@ -218,8 +223,8 @@ class StoreTagsManager(DatabaseManager):
                     'id': tag_id,
                     'label': tag_label,
                     'slug': tag_slug,
-                    'created_at': datetime.now().isoformat(),
-                    'updated_at': datetime.now().isoformat()
+                    'created_at': now,
+                    'updated_at': now
                 }
                 tag_records.append(tag_record)
                 
@@ -230,12 +235,11 @@ class StoreTagsManager(DatabaseManager):
                     'tag_slug': tag_slug
                 })
         
-        if tag_records:
-            with self._db_lock:
-                self.bulk_insert_or_ignore('tags', tag_records)
-        
-        if market_tag_records:
-            with self._db_lock:
-                self.bulk_insert_or_ignore('market_tags', market_tag_records)
+        # Tags and their market links go in one transaction
+        with self._db_lock:
+            self.bulk_write([
+                ('tags', tag_records, 'IGNORE'),
+                ('market_tags', market_tag_records, 'IGNORE')
+            ])
         
         self.logger.debug(f"Stored {len(tags)} tags for market {market_id}")
\ No newline at end of file
@@ -8,6 +8,7 @@ import json
 from threading import Lock
 from typing import Dict, List
 from backend.database.database_manager import DatabaseManager
+from backend.database.entity.store_users import ACTIVITY_COLUMNS, activity_row, write_portfolio_values
 
 class StoreTransactionsManager(DatabaseManager):
     """Manager for storing transaction data with thread-safe operations"""
@@ -127,71 +128,16 @@ class StoreTransactionsManager(DatabaseManager):
         if not activities:
             return
         
-        activity_data = []
-        
-        for activity in activities:
-            activity_data.append({
-                'proxy_wallet': activity.get('proxyWallet'),
-                'timestamp': activity.get('timestamp'),
-                'condition_id': activity.get('conditionId'),
-                'transaction_hash': activity.get('transactionHash'),
-                'type': activity.get('type'),
-                'side': activity.get('side'),
-                'size': activity.get('size'),
-                'usdc_size': activity.get('usdcSize'),
-                'price': activity.get('price'),
-                'asset': activity.get('asset'),
-                'outcome_index': activity.get('outcomeIndex'),
-                'title': activity.get('title'),
-                'slug': activity.get('slug'),
-                'event_slug': activity.get('eventSlug'),
-                'outcome': activity.get('outcome'),
-                'username': activity.get('name'),
-                'pseudonym': activity.get('pseudonym'),
-                'bio': activity.get('bio'),
-                'profile_image': activity.get('profileImage')
-            })
+        rows = [activity_row(activity) for activity in activities]
         
         with self._db_lock:
-            self.bulk_insert_or_ignore('user_activity', activity_data, batch_size=100)
-            self.logger.info(f"Bulk inserted {len(activity_data)} activities")
+            self.bulk_insert_rows('user_activity', ACTIVITY_COLUMNS, rows)
+            self.logger.info(f"Bulk inserted {len(rows)} activities")
 
     def _bulk_insert_values(self, values: List[Dict]):
-        """Bulk insert portfolio values (thread-safe)"""
-        if not values:
-            return
-        
-        value_data = []
-        user_updates = []
-        
-        for val in values:
-            if val['fetched']:
-                value_data.append({
-                    'proxy_wallet': val['wallet'],
-                    'market_condition_id': None,
-                    'value': val['value']
-                })
-                
-                user_updates.append({
-                    'proxy_wallet': val['wallet'],
-                    'total_value': val['value'],
-                    'last_updated': datetime.now()
-                })
+        """Bulk insert portfolio values and update user totals in one transaction (thread-safe)"""
+        with self._db_lock:
+            written = write_portfolio_values(self, values)
         
-        # Bulk insert values
-        if value_data:
-            with self._db_lock:
-                self.bulk_insert_or_replace('user_values', value_data, batch_size=100)
-                
-                # Update users table
-                for update in user_updates:
-                    self.execute_query("""
-                        UPDATE users SET total_value = ?, last_updated = ?
-                        WHERE proxy_wallet = ?
-                    """, (update['total_value'], update['last_updated'], update['proxy_wallet']), commit=False)
-                
-                # Commit all updates
-                conn = self.get_connection()
-                conn.commit()
-            
-        self.logger.info(f"Bulk inserted {len(value_data)} portfolio values")
\ No newline at end of file
+        if written:
+            self.logger.info(f"Bulk inserted {written} portfolio values")
\ No newline at end of file
@@ -5,10 +5,75 @@ Handles storage functionality for users data
 
 from datetime import datetime
 import json
+import sqlite3
 from threading import Lock
 from typing import Dict, List
 from backend.database.database_manager import DatabaseManager
 
+# user_activity columns in the order of the row tuples built by activity_row
+ACTIVITY_COLUMNS = (
+    'proxy_wallet', 'timestamp', 'condition_id', 'transaction_hash', 'type',
+    'side', 'size', 'usdc_size', 'price', 'asset', 'outcome_index', 'title',
+    'slug', 'event_slug', 'outcome', 'username', 'pseudonym', 'bio', 'profile_image'
+)
+
+
+def activity_row(activity: Dict) -> tuple:
+    """Build a user_activity row in ACTIVITY_COLUMNS order from an API activity record"""
+    get = activity.get
+    return (
+        get('proxyWallet'), get('timestamp'), get('conditionId'), get('transactionHash'), get('type'),
+        get('side'), get('size'), get('usdcSize'), get('price'), get('asset'), get('outcomeIndex'), get('title'),
+        get('slug'), get('eventSlug'), get('outcome'), get('name'), get('pseudonym'), get('bio'), get('profileImage')
+    )
+
+
+def write_portfolio_values(db: DatabaseManager, values: List[Dict]) -> int:
+    """
+    Insert fetched portfolio values into user_values and update each user's total_value, in one transaction
+    
+    Args:
+        db: Manager whose connection is used; callers hold their own write lock
+        values: Dicts with 'wallet', 'value' and 'fetched' (entries not fetched are skipped)
+    
+    Returns:
+        Number of values written
+    """
+    now = datetime.now().isoformat()
+    value_rows = []
+    user_updates = []
+    
+    for val in values:
+        if val['fetched']:
+            value_rows.append((val['wallet'], None, val['value']))
+            user_updates.append((val['value'], now, val['wallet']))
+    
+    if not value_rows:
+        return 0
+    
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany("""
+            INSERT OR REPLACE INTO user_values (proxy_wallet, market_condition_id, value)
+            VALUES (?, ?, ?)
+        """, value_rows)
+        cursor.executemany("""
+            UPDATE users SET total_value = ?, last_updated = ?
+            WHERE proxy_wallet = ?
+        """, user_updates)
+        conn.commit()
+        return len(value_rows)
+        
+    except sqlite3.Error as e:
+        db.logger.error(f"Bulk insert error in user_values: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
 class StoreUsersManager(DatabaseManager):
     """Manager for storing user data with thread-safe operations"""
 
@@ -30,76 +95,21 @@ class StoreUsersManager(DatabaseManager):
         if not activities:
             return
         
-        # Prepare data for bulk insert
-        activity_data = []
-        
-        for activity in activities:
-            activity_data.append({
-                'proxy_wallet': activity.get('proxyWallet'),
-                'timestamp': activity.get('timestamp'),
-                'condition_id': activity.get('conditionId'),
-                'transaction_hash': activity.get('transactionHash'),
-                'type': activity.get('type'),
-                'side': activity.get('side'),
-                'size': activity.get('size'),
-                'usdc_size': activity.get('usdcSize'),
-                'price': activity.get('price'),
-                'asset': activity.get('asset'),
-                'outcome_index': activity.get('outcomeIndex'),
-                'title': activity.get('title'),
-                'slug': activity.get('slug'),
-                'event_slug': activity.get('eventSlug'),
-                'outcome': activity.get('outcome'),
-                'username': activity.get('name'),
-                'pseudonym': activity.get('pseudonym'),
-                'bio': activity.get('bio'),
-                'profile_image': activity.get('profileImage')
-            })
+        # Tuples straight from the API records, with no intermediate dict per activity
+        rows = [activity_row(activity) for activity in activities]
         
         # Bulk insert with INSERT OR IGNORE to avoid duplicates
         with self._db_lock:
-            self.bulk_insert_or_ignore('user_activity', activity_data, batch_size=100)
-            self.logger.info(f"Bulk inserted {len(activity_data)} activities")
+            self.bulk_insert_rows('user_activity', ACTIVITY_COLUMNS, rows)
+            self.logger.info(f"Bulk inserted {len(rows)} activities")
 
     def _bulk_insert_values(self, values: List[Dict]):
-        """Bulk insert portfolio values (thread-safe)"""
-        if not values:
-            return
-        
-        value_data = []
-        user_updates = []
-        
-        for val in values:
-            if val['fetched']:
-                value_data.append({
-                    'proxy_wallet': val['wallet'],
-                    'market_condition_id': None,
-                    'value': val['value']
-                })
-                
-                user_updates.append({
-                    'proxy_wallet': val['wallet'],
-                    'total_value': val['value'],
-                    'last_updated': datetime.now()
-                })
+        """Bulk insert portfolio values and update user totals in one transaction (thread-safe)"""
+        with self._db_lock:
+            written = write_portfolio_values(self, values)
         
-        # Bulk insert values
-        if value_data:
-            with self._db_lock:
-                self.bulk_insert_or_replace('user_values', value_data, batch_size=100)
-                
-                # Update users table
-                for update in user_updates:
-                    self.execute_query("""
-                        UPDATE users SET total_value = ?, last_updated = ?
-                        WHERE proxy_wallet = ?
-                    """, (update['total_value'], update['last_updated'], update['proxy_wallet']), commit=False)
-                
-                # Commit all updates
-                conn = self.get_connection()
-                conn.commit()
-            
-        self.logger.info(f"Bulk inserted {len(value_data)} portfolio values")
+        if written:
+            self.logger.info(f"Bulk inserted {written} portfolio values")
 
     def _store_user_activity(self, proxy_wallet: str, activity: List[Dict]):
         """Store user activity (thread-safe)"""
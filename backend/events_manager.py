@@ -59,18 +59,19 @@ class EventsManager:
         
         return logger
     
-    def fetch_all_events(self, closed: bool = False, limit: int = 100, num_threads: int = 5) -> List[Dict]:
+    def fetch_all_events(self, closed: bool = False, limit: int = 100, num_threads: int = None) -> List[Dict]:
         """
         Fetch all events and store them in the database
         
         Args:
             closed: Whether to fetch closed events (always False for active events only)
             limit: Events per batch request
-            num_threads: Number of concurrent threads
+            num_threads: Number of concurrent threads (default: Config.HTTP_WORKERS)
             
         Returns:
             List of all fetched events
         """
+        num_threads = num_threads or self.config.HTTP_WORKERS
         self.logger.info(f"Starting event fetch (threads={num_threads})...")
         
         # Fetch all events using batch fetcher
@@ -249,7 +250,7 @@ class EventsManager:
         self.logger.info("Starting daily event scan...")
         
         # Fetch only active events
-        active_events = self.fetch_all_events(closed=False, num_threads=5)
+        active_events = self.fetch_all_events(closed=False)
         
         if active_events and self.config.FETCH_DETAILED_INFO:
             # Process detailed information for events
@@ -3,28 +3,58 @@ Batch comments
 Handles batch fetching for the comments of markets and events
 """
 
-import requests
-import time
-from datetime import datetime
-from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+import orjson
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from operator import itemgetter
+from queue import Queue, Empty
+from threading import Lock, Semaphore, Thread
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_comments import StoreCommentsManager
+from backend.fetch.http_pool import create_session
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+
+_get_id = itemgetter('id')
+
+
+def _may_have_reactions(comment: Dict) -> bool:
+    """False only when the comment payload itself reports zero reactions"""
+    return comment.get('reactionCount') != 0
+
 
 class BatchCommentsManager(DatabaseManager):
     """Manager for batch comment fetching with multithreading support"""
 
-    def __init__(self):
+    def __init__(self, max_workers: int = None):
         super().__init__()
         self.config = Config
         self.base_url = Config.GAMMA_API_URL
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreCommentsManager()
         
-        # Set max workers
-        self.max_workers = min(10, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 10))
+        # Network-bound, so sized by HTTP_WORKERS rather than the CPU-oriented MAX_WORKERS.
+        # Workers only bound concurrency; the request rate is set by the Gamma host limiter below
+        self.max_workers = max_workers or Config.HTTP_WORKERS
+        
+        # Keep-alive HTTP session shared by all worker threads
+        self.session = create_session(pool_size=self.max_workers * 2)
+        
+        # Gamma requests are paced by the limiter shared with every other manager on this host
+        self.limiter = host_limiter(self.base_url)
+        
+        # Caps in-flight HTTP requests across comment and reaction workers
+        self._request_semaphore = Semaphore(self.max_workers * 2)
+        
+        # Pipeline stage sizing: reactions dominate the call count, so they get the wider pool
+        self._reaction_workers = self.max_workers * 2
+        self._write_queue_size = 200
+        self._write_batch_size = 100
+        
+        # Endpoint URLs built once instead of per request
+        self._comments_url = f"{self.base_url}/comments"
+        self._reactions_url = f"{self.base_url}/comments/{{}}/reactions".format
         
         # Thread-safe counters
         self._progress_lock = Lock()
@@ -32,6 +62,15 @@ class BatchCommentsManager(DatabaseManager):
         self._error_counter = 0
         self._comments_counter = 0
         self._reactions_counter = 0
+        
+        # Entities whose comments fetch recently came back empty
+        self._known_no_comments = set()
+        self._new_no_comments = []
+
+    def close_connection(self):
+        """Close pooled HTTP connections and the cached read connection"""
+        self.session.close()
+        super().close_connection()
 
     def fetch_comments_for_all_events(self, limit_per_event: int = 15) -> Dict[str, int]:
         """
@@ -45,35 +84,20 @@ class BatchCommentsManager(DatabaseManager):
         """
         self.logger.info(f"💬 Fetching top {limit_per_event} comments for all active events...")
         
-        # Get all active events
-        events = self.fetch_all("""
+        total_events = self.fetch_one("SELECT COUNT(*) as count FROM events WHERE active = 1")['count']
+        
+        # Stream active events in keyset pages instead of materializing them all up front
+        events = self.fetch_iter("""
             SELECT id, title FROM events 
-            WHERE active = 1 
-            ORDER BY volume DESC
+            WHERE active = 1
         """)
         
-        self.logger.info(f"Processing {len(events)} events using {self.max_workers} threads...")
+        self.logger.info(f"Processing {total_events} events using {self.max_workers} threads...")
         
-        # Reset counters
-        self._progress_counter = 0
-        self._error_counter = 0
-        self._comments_counter = 0
-        self._reactions_counter = 0
+        # Params shared by every request in this run
+        base_params = {"parentEntityType": "Event", "limit": limit_per_event, "order": "newest"}
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_event = {
-                executor.submit(self._fetch_and_store_event_comments, event, limit_per_event, len(events)): event 
-                for event in events
-            }
-            
-            # Process completed tasks
-            for future in as_completed(future_to_event):
-                event = future_to_event[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    self.logger.error(f"Error processing event {event['id']}: {e}")
+        self._process_entities(events, total_events, base_params, 'event_id', 50)
         
         self.logger.info(f"✅ Comments fetch complete!")
         self.logger.info(f"   Events processed: {self._progress_counter}")
@@ -100,35 +124,20 @@ class BatchCommentsManager(DatabaseManager):
         """
         self.logger.info(f"💬 Fetching top {limit_per_market} comments for all active markets...")
         
-        # Get all active markets
-        markets = self.fetch_all("""
+        total_markets = self.fetch_one("SELECT COUNT(*) as count FROM markets WHERE active = 1")['count']
+        
+        # Stream active markets in keyset pages instead of materializing them all up front
+        markets = self.fetch_iter("""
             SELECT id, question FROM markets 
-            WHERE active = 1 
-            ORDER BY volume DESC
+            WHERE active = 1
         """)
         
-        self.logger.info(f"Processing {len(markets)} markets using {self.max_workers} threads...")
+        self.logger.info(f"Processing {total_markets} markets using {self.max_workers} threads...")
         
-        # Reset counters
-        self._progress_counter = 0
-        self._error_counter = 0
-        self._comments_counter = 0
-        self._reactions_counter = 0
+        # Params shared by every request in this run
+        base_params = {"parentEntityType": "market", "limit": limit_per_market, "order": "newest"}
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_market = {
-                executor.submit(self._fetch_and_store_market_comments, market, limit_per_market, len(markets)): market 
-                for market in markets
-            }
-            
-            # Process completed tasks
-            for future in as_completed(future_to_market):
-                market = future_to_market[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    self.logger.error(f"Error processing market {market['id']}: {e}")
+        self._process_entities(markets, total_markets, base_params, 'market_id', 100)
         
         self.logger.info(f"✅ Comments fetch complete!")
         self.logger.info(f"   Markets processed: {self._progress_counter}")
@@ -143,134 +152,248 @@ class BatchCommentsManager(DatabaseManager):
             'errors': self._error_counter
         }
 
-    def _fetch_and_store_event_comments(self, event: Dict, limit: int, total_events: int):
+    def _process_entities(self, entities: Iterator[Dict], total: int, base_params: Dict,
+                          entity_key: str, log_interval: int):
         """
-        Thread-safe wrapper for fetching and storing event comments
+        Fetch and store comments for a stream of entities as a three-stage pipeline:
+        entity workers fetch comments, reaction workers fetch reactions, and a single
+        writer thread drains both into the database. Bounded queues give backpressure.
+        
+        Args:
+            entities: Iterator of entity rows (each with an 'id')
+            total: Total number of entities (for progress logging)
+            base_params: Request params shared by every entity in the run
+            entity_key: Comment column the entity ID is stored under ('event_id' or 'market_id')
+            log_interval: Log progress every N entities
+        """
+        # Reset counters
+        self._progress_counter = 0
+        self._error_counter = 0
+        self._comments_counter = 0
+        self._reactions_counter = 0
+        
+        entity_label = entity_key.replace('_id', '')
+        self._known_no_comments = self._load_known_no_comments(entity_label)
+        self._new_no_comments = []
+        skipped = 0
+        max_inflight = self.max_workers * 4
+        inflight = {}
+        
+        # Writer stage
+        write_queue = Queue(maxsize=self._write_queue_size)
+        writer = Thread(target=self._write_loop, args=(write_queue, entity_key), daemon=True)
+        writer.start()
+        
+        # Caps queued reaction tasks so the comments stage can't run far ahead of the reactions stage
+        reaction_slots = Semaphore(self._reaction_workers * 4)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=self._reaction_workers) as reactions_executor:
+            # Keep at most max_inflight entities queued, pulling the next row as tasks finish
+            for entity in entities:
+                # Entities with no comments on a recent run are skipped without an API call
+                if entity['id'] in self._known_no_comments:
+                    skipped += 1
+                    with self._progress_lock:
+                        self._progress_counter += 1
+                    continue
+                
+                if len(self._new_no_comments) >= 500:
+                    self._flush_no_comments(entity_label)
+                
+                if len(inflight) >= max_inflight:
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._log_entity_result(future, inflight.pop(future), entity_label)
+                
+                future = executor.submit(self._fetch_entity_comments, entity['id'], base_params, entity_key,
+                                         total, reactions_executor, reaction_slots, write_queue, log_interval)
+                inflight[future] = entity
+            
+            # Process remaining tasks
+            for future in as_completed(inflight):
+                self._log_entity_result(future, inflight[future], entity_label)
+        
+        # Both pools have drained, so every write is queued; stop the writer once it catches up
+        write_queue.put(None)
+        writer.join()
+        
+        self._flush_no_comments(entity_label)
+        
+        if skipped:
+            self.logger.info(f"   Skipped {skipped} {entity_label}s with no comments in the last "
+                             f"{self.config.COMMENTS_EMPTY_TTL_HOURS}h")
+
+    def _load_known_no_comments(self, entity_type: str) -> set:
+        """Load IDs of entities whose comments fetch came back empty within the TTL"""
+        cutoff = (datetime.now() - timedelta(hours=self.config.COMMENTS_EMPTY_TTL_HOURS)).isoformat()
+        rows = self.fetch_all("""
+            SELECT entity_id FROM comment_empty_entities
+            WHERE entity_type = ? AND checked_at >= ?
+        """, (entity_type, cutoff))
+        return {row['entity_id'] for row in rows}
+
+    def _flush_no_comments(self, entity_type: str):
+        """Persist entities recorded as having no comments since the last flush"""
+        with self._progress_lock:
+            entity_ids, self._new_no_comments = self._new_no_comments, []
+        
+        if entity_ids:
+            now = datetime.now().isoformat()
+            self.bulk_insert_or_replace('comment_empty_entities', [
+                {'entity_type': entity_type, 'entity_id': entity_id, 'checked_at': now}
+                for entity_id in entity_ids
+            ])
+
+    def _log_entity_result(self, future, entity: Dict, entity_label: str):
+        """Surface the exception of a finished entity task, if any"""
+        try:
+            future.result()
+        except Exception as e:
+            self.logger.error(f"Error processing {entity_label} {entity['id']}: {e}")
+
+    def _fetch_entity_comments(self, entity_id: str, base_params: Dict, entity_key: str, total: int,
+                               reactions_executor: ThreadPoolExecutor, reaction_slots: Semaphore,
+                               write_queue: Queue, log_interval: int):
+        """
+        Comments stage: fetch the comments of one event or market, queue them for writing
+        and hand each comment to the reactions stage
+        
+        Args:
+            entity_id: Event or market ID
+            base_params: Request params shared by every entity in the run
+            entity_key: Comment column the entity ID is stored under ('event_id' or 'market_id')
+            total: Total number of entities in the run (for progress logging)
+            reactions_executor: Pool running the reactions stage
+            reaction_slots: Bounds reaction tasks queued but not yet finished
+            write_queue: Queue drained by the writer thread
+            log_interval: Log progress every N entities
         """
         try:
-            comments = self._fetch_comments(
-                parent_entity_type='Event',
-                parent_entity_id=event['id'],
-                limit=limit
-            )
+            comments = self._fetch_comments(base_params, entity_id)
 
             if comments:
-                # Store comments
-                with self._lock:
-                    self.store_manager._store_comments(comments, event_id=event['id'])
-
-                with self._progress_lock:
-                    self._comments_counter += len(comments)
+                # Comments are queued before their reactions, so the writer stores them first
+                write_queue.put(('comments', entity_id, comments))
 
-                # Fetch reactions for each comment
-                for comment in comments:
-                    reactions = self._fetch_comment_reactions(comment['id'])
-                    if reactions:
-                        with self._lock:
-                            self.store_manager._store_comment_reactions(comment['id'], reactions)
-                        with self._progress_lock:
-                            self._reactions_counter += len(reactions)
+                submit = reactions_executor.submit
+                acquire = reaction_slots.acquire
+                fetch_reactions = self._fetch_and_queue_reactions
+                # Comments reporting no reactions would only return an empty list
+                for comment_id in map(_get_id, filter(_may_have_reactions, comments)):
+                    acquire()
+                    submit(fetch_reactions, comment_id, reaction_slots, write_queue)
 
             with self._progress_lock:
+                # An empty (not failed) fetch marks the entity to be skipped next run
+                if comments == []:
+                    self._new_no_comments.append(entity_id)
                 self._progress_counter += 1
-                if self._progress_counter % 50 == 0 or self._progress_counter == total_events:
+                if self._progress_counter % log_interval == 0 or self._progress_counter == total:
+                    entity_label = entity_key.replace('_id', 's')
                     self.logger.info(
-                        f"  Progress: {self._progress_counter}/{total_events} events, {self._comments_counter} comments")
-
-            # Rate limiting
-            time.sleep(self.config.RATE_LIMIT_DELAY / self.max_workers)
+                        f"  Progress: {self._progress_counter}/{total} {entity_label}, {self._comments_counter} comments")
 
         except Exception as e:
             with self._progress_lock:
                 self._error_counter += 1
             raise e
 
-    def _fetch_and_store_market_comments(self, market: Dict, limit: int, total_markets: int):
+    def _fetch_and_queue_reactions(self, comment_id: str, reaction_slots: Semaphore, write_queue: Queue):
+        """Reactions stage: fetch the reactions of one comment and queue them for writing"""
+        try:
+            reactions = self._fetch_comment_reactions(comment_id)
+            if reactions:
+                write_queue.put(('reactions', comment_id, reactions))
+        finally:
+            reaction_slots.release()
+
+    def _write_loop(self, write_queue: Queue, entity_key: str):
         """
-        Thread-safe wrapper for fetching and storing market comments
+        Writer stage: drain queued comments and reactions in batches until the None sentinel
+        
+        Args:
+            write_queue: Queue fed by the comments and reactions stages
+            entity_key: Comment column the entity ID is stored under ('event_id' or 'market_id')
         """
-        try:
-            comments = self._fetch_comments(
-                parent_entity_type='market',
-                parent_entity_id=market['id'],
-                limit=limit
-            )
+        get_nowait = write_queue.get_nowait
+        running = True
 
-            if comments:
-                # Store comments
-                with self._lock:
-                    self.store_manager._store_comments(comments, market_id=market['id'])
+        while running:
+            batch = [write_queue.get()]
+            try:
+                while len(batch) < self._write_batch_size:
+                    batch.append(get_nowait())
+            except Empty:
+                pass
 
-                with self._progress_lock:
-                    self._comments_counter += len(comments)
+            if batch[-1] is None:
+                batch.pop()
+                running = False
 
-                # Fetch reactions for each comment
-                for comment in comments:
-                    reactions = self._fetch_comment_reactions(comment['id'])
-                    if reactions:
-                        with self._lock:
-                            self.store_manager._store_comment_reactions(comment['id'], reactions)
-                        with self._progress_lock:
-                            self._reactions_counter += len(reactions)
+            comment_batches = []
+            reactions_by_comment = []
+            for kind, key, records in batch:
+                if kind == 'comments':
+                    comment_batches.append((key, records))
+                else:
+                    reactions_by_comment.append((key, records))
 
-            with self._progress_lock:
-                self._progress_counter += 1
-                if self._progress_counter % 100 == 0 or self._progress_counter == total_markets:
-                    self.logger.info(
-                        f"  Progress: {self._progress_counter}/{total_markets} markets, {self._comments_counter} comments")
+            try:
+                # Comments first, so reactions in the same batch find their parent rows
+                for entity_id, comments in comment_batches:
+                    self.store_manager._store_comments(comments, **{entity_key: entity_id})
+                if reactions_by_comment:
+                    self.store_manager._store_comment_reactions_bulk(reactions_by_comment)
 
-            # Rate limiting
-            time.sleep(self.config.RATE_LIMIT_DELAY / self.max_workers)
+                with self._progress_lock:
+                    self._comments_counter += sum(len(c) for _, c in comment_batches)
+                    self._reactions_counter += sum(len(r) for _, r in reactions_by_comment)
 
-        except Exception as e:
-            with self._progress_lock:
-                self._error_counter += 1
-            raise e
+            except Exception as e:
+                self.logger.error(f"Error writing comments batch: {e}")
+                with self._progress_lock:
+                    self._error_counter += 1
 
-    def _fetch_comments(self, parent_entity_type: str, parent_entity_id: str, limit: int) -> List[Dict]:
+    def _fetch_comments(self, base_params: Dict, parent_entity_id: str) -> Optional[List[Dict]]:
         """
         Fetch comments for a specific entity (event or market)
+        Returns None if the request failed, so failures are not mistaken for empty entities
         """
         try:
-            url = f"{self.base_url}/comments"
-            params = {
-                "parentEntityType": parent_entity_type,
-                "parentEntityId": parent_entity_id,
-                "limit": limit,
-                "order": "newest"
-            }
+            params = {**base_params, "parentEntityId": parent_entity_id}
             
-            response = requests.get(
-                url,
-                params=params,
-                headers=self.config.get_api_headers(),
-                timeout=self.config.REQUEST_TIMEOUT
-            )
+            with self._request_semaphore:
+                response = throttled_get(
+                    self.session,
+                    self.limiter,
+                    self._comments_url,
+                    params=params,
+                    timeout=self.config.REQUEST_TIMEOUT
+                )
+            response.raise_for_status()
             
-            if response.status_code == 200:
-                return response.json() or []
-            return []
+            return orjson.loads(response.content) or []
             
         except Exception as e:
-            self.logger.error(f"Error fetching comments for {parent_entity_type} {parent_entity_id}: {e}")
-            return []
+            self.logger.error(f"Error fetching comments for {base_params['parentEntityType']} {parent_entity_id}: {e}")
+            return None
 
     def _fetch_comment_reactions(self, comment_id: str) -> List[Dict]:
         """
         Fetch reactions for a specific comment
         """
         try:
-            url = f"{self.base_url}/comments/{comment_id}/reactions"
-            
-            response = requests.get(
-                url,
-                headers=self.config.get_api_headers(),
-                timeout=self.config.REQUEST_TIMEOUT
-            )
+            with self._request_semaphore:
+                response = throttled_get(
+                    self.session,
+                    self.limiter,
+                    self._reactions_url(comment_id),
+                    timeout=self.config.REQUEST_TIMEOUT
+                )
+            response.raise_for_status()
             
-            if response.status_code == 200:
-                return response.json() or []
-            return []
+            return orjson.loads(response.content) or []
             
         except Exception as e:
             self.logger.error(f"Error fetching reactions for comment {comment_id}: {e}")
@@ -5,16 +5,28 @@ Handles batch fetching operations for events from Polymarket API
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List
+import orjson
 import requests
 import logging
+from backend.fetch.http_pool import create_session
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class BatchEventsFetcher:
     """Handles batch fetching of events with multithreading support"""
     
-    def __init__(self, config, base_url: str):
+    def __init__(self, config, base_url: str, max_workers: int = None):
         self.config = config
         self.base_url = base_url
         self.logger = logging.getLogger(self.__class__.__name__)
+        
+        # Workers only bound concurrency; the request rate is set by the Gamma host limiter below
+        self.max_workers = max_workers or config.HTTP_WORKERS
+        
+        # Keep-alive HTTP session with retries on transient failures
+        self.session = create_session(pool_size=self.max_workers * 2)
+        
+        # Gamma requests are paced by the limiter shared with every other manager on this host
+        self.limiter = host_limiter(self.base_url)
 
     def fetch_events_batch(self, offset: int, limit: int) -> List[Dict]:
         """
@@ -36,15 +48,16 @@ class BatchEventsFetcher:
                 "ascending": "false"
             }
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 f"{self.base_url}/events",
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            events = response.json()
+            events = orjson.loads(response.content)
             return events if events else []
             
         except requests.exceptions.RequestException as e:
@@ -54,17 +67,18 @@ class BatchEventsFetcher:
             self.logger.error(f"Unexpected error at offset {offset}: {e}")
             return []
 
-    def fetch_all_events(self, limit: int = 100, num_threads: int = 5) -> List[Dict]:
+    def fetch_all_events(self, limit: int = 100, num_threads: int = None) -> List[Dict]:
         """
         Fetch all active events from the API with multithreading
         
         Args:
             limit: Events per request
-            num_threads: Number of concurrent threads
+            num_threads: Number of concurrent threads (default: max_workers)
             
         Returns:
             List of all fetched events
         """
+        num_threads = num_threads or self.max_workers
         self.logger.info(f"Starting multithreaded fetch of active events ({num_threads} threads)...")
         
         # First batch to determine if we need more
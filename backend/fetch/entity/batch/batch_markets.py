@@ -3,13 +3,22 @@ Batch markets
 Handles batch fetching for the markets
 """
 
+import orjson
 import requests
+from datetime import datetime, timedelta
 from typing import Dict, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from concurrent.futures import as_completed
+from itertools import count
+from queue import Queue, Empty
+from threading import Lock, Thread
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_markets import StoreMarketsManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+
+# Static request params, shared by every markets request
+_MARKETS_PARAMS = {"limit": 100, "order": "volume", "ascending": "false"}
 
 class BatchMarketsManager(DatabaseManager):
     """Manager for batch market fetching with multithreading support"""
@@ -22,13 +31,21 @@ class BatchMarketsManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreMarketsManager()
         
-        # Thread-safe counters
-        self._progress_lock = Lock()
-        self._progress_counter = 0
-        self._error_counter = 0
+        # Progress ticks through itertools.count (next() is atomic under the GIL); the
+        # error total is a plain int read after the run, so it is guarded by _error_lock
+        self._progress_counter = count(1)
+        self._error_lock = Lock()
+        self._error_count = 0
         
-        # Set max workers
-        self.max_workers = min(20, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 20))
+        # Network-bound fan-out, so sized by HTTP_WORKERS rather than the CPU-oriented MAX_WORKERS
+        self.max_workers = Config.HTTP_WORKERS
+
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+
+        # Adaptive request budget shared with every other manager calling the same host
+        self.limiter = host_limiter(self.base_url)
 
     def fetch_all_markets_from_events(self, events: List[Dict]) -> List[Dict]:
         """
@@ -36,39 +53,73 @@ class BatchMarketsManager(DatabaseManager):
         Used after fetching events to get their markets
         """
         all_markets = []
+        
+        # Drop duplicate events and events whose markets were stored recently
+        unique_events = {event['id']: event for event in events}
+        fresh = self._recently_fetched_event_ids(list(unique_events))
+        events = [event for event_id, event in unique_events.items() if event_id not in fresh]
+        if fresh:
+            self.logger.info(f"Skipping {len(fresh)} events with markets fetched in the last "
+                             f"{self.config.MARKETS_FRESH_MINUTES} minutes")
+        
         total_events = len(events)
 
         self.logger.info(f"Fetching markets for {total_events} events using {self.max_workers} threads...")
 
         # Reset counters
-        self._progress_counter = 0
-        self._error_counter = 0
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_event = {
-                executor.submit(self._fetch_and_store_event_markets, event, idx, total_events): event
-                for idx, event in enumerate(events, 1)
-            }
-
-            # Process completed tasks
-            for future in as_completed(future_to_event):
-                event = future_to_event[future]
-                try:
-                    markets = future.result()
-                    if markets:
-                        all_markets.extend(markets)
-                except Exception as e:
-                    event_id = event.get('id') if isinstance(event, dict) else event
-                    self.logger.error(f"Error in thread processing event {event_id}: {e}")
+        self._progress_counter = count(1)
+        self._error_count = 0
+
+        # Workers only fetch; a single writer thread drains their results in bulk
+        write_queue = Queue()
+        writer = Thread(target=self._write_loop, args=(write_queue,), daemon=True)
+        writer.start()
+
+        executor = self.executor
+        # Submit all tasks
+        future_to_event = {
+            executor.submit(self._fetch_and_store_event_markets, event, idx, total_events, write_queue): event
+            for idx, event in enumerate(events, 1)
+        }
+
+        # Process completed tasks
+        for future in as_completed(future_to_event):
+            event = future_to_event[future]
+            try:
+                markets = future.result()
+                if markets:
+                    all_markets.extend(markets)
+            except Exception as e:
+                event_id = event.get('id') if isinstance(event, dict) else event
+                self.logger.error(f"Error in thread processing event {event_id}: {e}")
+
+        # Every fetch has finished; stop the writer once it has flushed the rest
+        write_queue.put(None)
+        writer.join()
 
         self.logger.info(f"Total markets fetched: {len(all_markets)}")
-        self.logger.info(f"Errors encountered: {self._error_counter}")
+        self.logger.info(f"Errors encountered: {self._error_count}")
         return all_markets
 
-    def _fetch_and_store_event_markets(self, event: Dict, idx: int, total: int) -> List[Dict]:
+    def _recently_fetched_event_ids(self, event_ids: List[str], chunk_size: int = 500) -> set:
+        """Return the subset of event_ids whose markets were fetched within MARKETS_FRESH_MINUTES"""
+        cutoff = (datetime.now() - timedelta(minutes=self.config.MARKETS_FRESH_MINUTES)).isoformat()
+        fresh = set()
+        
+        for i in range(0, len(event_ids), chunk_size):
+            chunk = event_ids[i:i + chunk_size]
+            placeholders = ','.join('?' for _ in chunk)
+            rows = self.fetch_all(f"""
+                SELECT DISTINCT event_id FROM markets
+                WHERE event_id IN ({placeholders}) AND fetched_at >= ?
+            """, (*chunk, cutoff))
+            fresh.update(row['event_id'] for row in rows)
+        
+        return fresh
+
+    def _fetch_and_store_event_markets(self, event: Dict, idx: int, total: int, write_queue: Queue) -> List[Dict]:
         """
-        Fetch and store markets for a single event (thread-safe)
+        Fetch markets for a single event and queue them for the writer thread (thread-safe)
         """
         event_id = event.get('id')
         
@@ -76,44 +127,76 @@ class BatchMarketsManager(DatabaseManager):
             markets = self._fetch_markets_for_event(event_id)
             
             if markets:
-                # Thread-safe storage
-                with self._lock:
-                    self.store_manager._store_markets(markets, event_id)
+                write_queue.put((event_id, markets))
                 
-                with self._progress_lock:
-                    self._progress_counter += 1
-                    if self._progress_counter % 50 == 0 or self._progress_counter == total:
-                        self.logger.info(f"  Progress: {self._progress_counter}/{total} events processed")
+                processed = next(self._progress_counter)
+                if processed % 50 == 0 or processed == total:
+                    self.logger.info(f"  Progress: {processed}/{total} events processed")
             
             return markets
             
         except Exception as e:
-            with self._progress_lock:
-                self._error_counter += 1
+            self._record_error()
             self.logger.error(f"Error fetching markets for event {event_id}: {e}")
             return []
 
+    def _record_error(self):
+        """Count one failed fetch or write"""
+        with self._error_lock:
+            self._error_count += 1
+
+    def _write_loop(self, write_queue: Queue, batch_size: int = 500):
+        """
+        Single writer: store queued (event_id, markets) results in bulk until the None sentinel
+        
+        Args:
+            write_queue: Queue fed by the fetch workers
+            batch_size: Maximum events stored per flush
+        """
+        get_nowait = write_queue.get_nowait
+        running = True
+
+        while running:
+            batch = [write_queue.get()]
+            try:
+                while len(batch) < batch_size:
+                    batch.append(get_nowait())
+            except Empty:
+                pass
+
+            if batch[-1] is None:
+                batch.pop()
+                running = False
+
+            if batch:
+                try:
+                    self.store_manager._store_markets_bulk(batch)
+                except Exception:
+                    # Fall back to per-event writes so one bad event doesn't drop the whole batch
+                    for event_id, markets in batch:
+                        try:
+                            self.store_manager._store_markets(markets, event_id)
+                        except Exception as e:
+                            self._record_error()
+                            self.logger.error(f"Error storing markets for event {event_id}: {e}")
+
     def _fetch_markets_for_event(self, event_id: str) -> List[Dict]:
         """
         Fetch markets for a specific event
         """
         try:
             url = f"{self.base_url}/events/{event_id}/markets"
-            params = {
-                "limit": 100,
-                "order": "volume",
-                "ascending": "false"
-            }
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 url,
-                params=params,
-                headers=self.config.get_api_headers(),
+                params=_MARKETS_PARAMS,
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            markets = response.json()
+            markets = orjson.loads(response.content)
             return markets if markets else []
             
         except requests.exceptions.RequestException as e:
@@ -3,14 +3,29 @@ Batch positions
 Handles batch fetching for the positions
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from concurrent.futures import as_completed
+import heapq
+import orjson
+from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List
-import requests
-from threading import Lock
+from queue import Queue
+from threading import Lock, Thread
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
-from backend.database.entity.store_positions import StorePositionsManager
+from backend.database.entity.store_positions import StorePositionsManager, CURRENT_POSITION_COLUMNS
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+
+# Indexes into current position row tuples used for whale tracking
+_WALLET = CURRENT_POSITION_COLUMNS.index('proxy_wallet')
+_VALUE = CURRENT_POSITION_COLUMNS.index('current_value')
+_PNL = CURRENT_POSITION_COLUMNS.index('percent_pnl')
+_TITLE = CURRENT_POSITION_COLUMNS.index('title')
+
+# Static request params; the user is added per request
+_POSITIONS_PARAMS = (("sizeThreshold", "1"), ("limit", "100"), ("sortBy", "TOKENS"), ("sortDirection", "DESC"))
+_CLOSED_POSITIONS_PARAMS = (("limit", "50"), ("sortBy", "REALIZEDPNL"), ("sortDirection", "DESC"))
 
 class BatchPositionsManager(DatabaseManager):
     """Manager for batch position fetching"""
@@ -22,8 +37,15 @@ class BatchPositionsManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StorePositionsManager()
         
-        # Set max workers
-        self.max_workers = min(5, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 5))
+        # Network-bound fan-out, so sized by HTTP_WORKERS rather than the CPU-oriented MAX_WORKERS
+        self.max_workers = Config.HTTP_WORKERS
+
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+
+        # Adaptive request budget shared with every other manager calling the same host
+        self.limiter = host_limiter(self.data_api_url)
         
         # Thread-safe counters
         self._progress_lock = Lock()
@@ -35,103 +57,121 @@ class BatchPositionsManager(DatabaseManager):
 
     def fetch_user_positions_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch current positions for a batch of users using multithreading"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching current positions for {len(users)} users...")
         
         total_positions = 0
         users_with_positions = 0
         whale_positions = []
         
-        # Collect all positions in memory first
-        all_positions = []
+        value_updates = []
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_user_positions_api, user): user 
-                for user in users
-            }
-            
-            for future in as_completed(futures):
-                user = futures[future]
-                try:
-                    result = future.result()
-                    if result['positions']:
-                        all_positions.extend(result['positions'])
-                        users_with_positions += 1
-                        total_positions += len(result['positions'])
-                        whale_positions.extend(result['whale_positions'])
-                        
-                except Exception as e:
-                    self.logger.error(f"Error fetching positions for {user}: {e}")
-        
-        # Now bulk insert all positions at once
-        if all_positions:
-            self.store_manager._bulk_insert_positions(all_positions)
-        
-        # Sort and display top whale positions
-        whale_positions.sort(key=lambda x: x['value'], reverse=True)
-        
-        if whale_positions[:5]:
+        # Rows stream to a flusher thread in chunks instead of accumulating for one insert at the end
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_position_rows, 5000, 0.25),
+                         daemon=True)
+        flusher.start()
+        
+        executor = self.executor
+        futures = {
+            executor.submit(self._fetch_user_positions_api, user): user 
+            for user in users
+        }
+        
+        for future in as_completed(futures):
+            user = futures[future]
+            try:
+                result = future.result()
+                if result['positions']:
+                    row_queue.put(result['positions'])
+                    users_with_positions += 1
+                    total_positions += len(result['positions'])
+                    # Whale positions (>$10k value) are picked from the rows after the fetch
+                    whale_positions.extend(
+                        row for row in result['positions'] if (row[_VALUE] or 0) > 10000)
+                if result.get('total_value_update'):
+                    value_updates.append(result['total_value_update'])
+                    
+            except Exception as e:
+                self.logger.error(f"Error fetching positions for {user}: {e}")
+        
+        row_queue.put(None)
+        flusher.join()
+        self.logger.info(f"Inserted {total_positions} positions")
+        
+        # Update user totals in one transaction instead of a commit per user
+        if value_updates:
+            self.executemany("""
+                UPDATE users SET total_value = ?, last_updated = CURRENT_TIMESTAMP
+                WHERE proxy_wallet = ?
+            """, value_updates)
+        
+        # Display top whale positions (bounded heap instead of a full sort)
+        top_whales = heapq.nlargest(5, whale_positions, key=itemgetter(_VALUE))
+        
+        if top_whales:
             self.logger.info("🐋 Top 5 Whale Positions:")
-            for pos in whale_positions[:5]:
-                self.logger.info(f"   {pos['wallet'][:10]}... - {pos['title'][:40]}")
-                self.logger.info(f"     Value: ${pos['value']:,.2f} | P&L: {pos['pnl']:.2%}")
+            for row in top_whales:
+                self.logger.info(f"   {row[_WALLET][:10]}... - {(row[_TITLE] or '')[:40]}")
+                self.logger.info(f"     Value: ${row[_VALUE]:,.2f} | P&L: {row[_PNL] or 0:.2%}")
         
         return {
             'users_with_positions': users_with_positions,
             'total_positions': total_positions,
-            'whale_positions': len([p for p in whale_positions if p['value'] > 10000])
+            'whale_positions': len(whale_positions)
         }
 
     def fetch_closed_positions_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch closed positions for a batch of users"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching closed positions for {len(users)} users...")
         
-        all_positions = []
+        total_positions = 0
         big_winners = []
         big_losers = []
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Process in chunks
-            chunk_size = 50
-            for i in range(0, len(users), chunk_size):
-                chunk = users[i:i+chunk_size]
-                
-                futures = {
-                    executor.submit(self._fetch_closed_positions_api, user): user 
-                    for user in chunk
-                }
-                
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        all_positions.extend(result['positions'])
-                        big_winners.extend(result['winners'])
-                        big_losers.extend(result['losers'])
-                    except Exception as e:
-                        self.logger.debug(f"Error in closed positions batch: {e}")
-                
-                time.sleep(0.5)  # Small delay between chunks
+        # Rows are inserted by a flusher thread while fetches are still in flight
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_closed_positions, 1000, 0.25),
+                         daemon=True)
+        flusher.start()
+        
+        executor = self.executor
+        futures = [executor.submit(self._fetch_closed_positions_api, user) for user in users]
+        
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+                if result['positions']:
+                    row_queue.put(result['positions'])
+                    total_positions += len(result['positions'])
+                big_winners.extend(result['winners'])
+                big_losers.extend(result['losers'])
+            except Exception as e:
+                self.logger.debug(f"Error in closed positions batch: {e}")
         
-        # Bulk insert positions
-        if all_positions:
-            self.store_manager._bulk_insert_closed_positions(all_positions)
+        row_queue.put(None)
+        flusher.join()
+        self.logger.info(f"Inserted {total_positions} closed positions")
         
-        # Sort and display top winners/losers
-        big_winners.sort(key=lambda x: x['pnl'], reverse=True)
-        big_losers.sort(key=lambda x: x['pnl'])
+        # Display top winners/losers (bounded heap instead of a full sort)
+        top_winners = heapq.nlargest(3, big_winners, key=itemgetter('pnl'))
+        top_losers = heapq.nsmallest(3, big_losers, key=itemgetter('pnl'))
         
-        if big_winners[:3]:
+        if top_winners:
             self.logger.info("💰 Top 3 Winning Trades:")
-            for win in big_winners[:3]:
+            for win in top_winners:
                 self.logger.info(f"   {win['wallet'][:10]}... - P&L: ${win['pnl']:,.2f}")
         
-        if big_losers[:3]:
+        if top_losers:
             self.logger.info("💸 Top 3 Losing Trades:")
-            for loss in big_losers[:3]:
+            for loss in top_losers:
                 self.logger.info(f"   {loss['wallet'][:10]}... - P&L: ${loss['pnl']:,.2f}")
         
         return {
-            'total_positions': len(all_positions),
+            'total_positions': total_positions,
             'big_winners': len(big_winners),
             'big_losers': len(big_losers)
         }
@@ -140,79 +180,51 @@ class BatchPositionsManager(DatabaseManager):
         """Fetch current positions for a single user from API"""
         try:
             url = f"{self.data_api_url}/positions"
-            params = {
-                "user": proxy_wallet,
-                "sizeThreshold": "1",
-                "limit": "100",
-                "sortBy": "TOKENS",
-                "sortDirection": "DESC"
-            }
+            params = [("user", proxy_wallet), *_POSITIONS_PARAMS]
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, self.limiter, url, params=params, timeout=30)
             
             if response.status_code != 200:
-                return {'positions': [], 'whale_positions': []}
+                return {'positions': []}
             
-            positions = response.json()
+            positions = orjson.loads(response.content)
             
             if not positions:
-                return {'positions': [], 'whale_positions': []}
+                return {'positions': []}
             
-            # Prepare positions for batch insert
+            # Build insert-ready rows here so the bulk insert doesn't re-walk each dict
             processed_positions = []
-            whale_positions = []
             user_total_value = 0
+            updated_at = datetime.now().isoformat()
+            position_row = self.store_manager._current_position_row
             
             for position in positions:
-                # Add proxy_wallet to position data
-                position['proxyWallet'] = proxy_wallet
-                processed_positions.append(position)
+                processed_positions.append(position_row(position, proxy_wallet, updated_at))
                 
                 user_total_value += position.get('currentValue', 0)
-                
-                # Track whale positions (>$10k value)
-                if position.get('currentValue', 0) > 10000:
-                    whale_positions.append({
-                        'wallet': proxy_wallet,
-                        'title': position.get('title'),
-                        'value': position.get('currentValue'),
-                        'pnl': position.get('percentPnl', 0),
-                        'outcome': position.get('outcome')
-                    })
-            
-            # Update user total value (done separately)
-            if user_total_value > 0:
-                self.execute_query("""
-                    UPDATE users SET total_value = ?, last_updated = CURRENT_TIMESTAMP
-                    WHERE proxy_wallet = ?
-                """, (user_total_value, proxy_wallet), commit=True)
             
             return {
                 'positions': processed_positions,
-                'whale_positions': whale_positions
+                # Applied in one batch by the caller
+                'total_value_update': (user_total_value, proxy_wallet) if user_total_value > 0 else None
             }
             
         except Exception as e:
             self.logger.debug(f"Error fetching positions for {proxy_wallet}: {e}")
-            return {'positions': [], 'whale_positions': []}
+            return {'positions': []}
 
     def _fetch_closed_positions_api(self, proxy_wallet: str) -> Dict:
         """Fetch closed positions for a single user from API"""
         try:
             url = f"{self.data_api_url}/closed-positions"
-            params = {
-                "user": proxy_wallet,
-                "limit": "50",
-                "sortBy": "REALIZEDPNL",
-                "sortDirection": "DESC"
-            }
+            params = [("user", proxy_wallet), *_CLOSED_POSITIONS_PARAMS]
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, self.limiter, url, params=params, timeout=30)
             
             if response.status_code != 200:
                 return {'positions': [], 'winners': [], 'losers': []}
             
-            closed_positions = response.json()
+            closed_positions = orjson.loads(response.content)
             
             if not closed_positions:
                 return {'positions': [], 'winners': [], 'losers': []}
@@ -3,13 +3,19 @@ Batch series
 Handles batch fetching for the series
 """
 
-import time
+import orjson
 import requests
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import as_completed
 from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_series import StoreSeriesManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+
+# Static part of the series page params; limit and offset are added per page
+_SERIES_PARAMS = (("order", "volume"), ("ascending", "false"), ("include_chat", "true"))
 
 class BatchSeriesManager(DatabaseManager):
     """Manager for batch series fetching"""
@@ -21,69 +27,120 @@ class BatchSeriesManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreSeriesManager()
         
-        # Thread-safe counters
-        self._progress_lock = Lock()
-        self._progress_counter = 0
-        self._error_counter = 0
-        
         # Set max workers
         self.max_workers = min(20, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 20))
 
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+        
+        # Gamma requests are paced by the limiter shared with every other manager on this host
+        self.limiter = host_limiter(self.base_url)
+
     def fetch_all_series(self, limit: int = 100) -> List[Dict]:
         """
         Fetch all series from the API
         Used for initial data load and daily scans
+        
+        The first page is fetched alone. If the response reports a total count, exactly
+        the remaining pages are fetched in parallel; otherwise further pages are fetched
+        in parallel waves of max_workers offsets until a short or empty page is seen
         """
-        all_series = []
-        offset = 0
-
         self.logger.info("Starting to fetch all series...")
 
-        while True:
-            try:
-                url = f"{self.base_url}/series"
-                params = {
-                    "limit": limit,
-                    "offset": offset,
-                    "order": "volume",
-                    "ascending": "false",
-                    "include_chat": "true"
-                }
+        first_page, total = self._fetch_series_page(0, limit)
+        if not first_page:
+            self.logger.info("Total series fetched: 0")
+            return []
 
-                response = requests.get(
-                    url,
-                    params=params,
-                    headers=self.config.get_api_headers(),
-                    timeout=self.config.REQUEST_TIMEOUT
-                )
-                response.raise_for_status()
+        all_series = list(first_page)
+        self.store_manager._store_series_list(first_page)
+        self.logger.info(f"Fetched {len(first_page)} series (offset: 0)")
 
-                series_list = response.json()
+        if total is not None:
+            # Definite work list from the reported total, no probe past the last page
+            self._collect_series_pages(range(limit, total, limit), limit, all_series)
+        else:
+            offset = limit
+            done = len(first_page) < limit
 
-                if not series_list:
-                    break
+            while not done:
+                offsets = range(offset, offset + limit * self.max_workers, limit)
+                offset = offsets[-1] + limit
+                done = self._collect_series_pages(offsets, limit, all_series)
 
-                all_series.extend(series_list)
+        self.logger.info(f"Total series fetched: {len(all_series)}")
+        return all_series
 
-                # Store series
-                self.store_manager._store_series_list(series_list)
+    def _collect_series_pages(self, offsets: range, limit: int, all_series: List[Dict]) -> bool:
+        """
+        Fetch and store the given series pages in parallel
+        
+        Returns:
+            True if any page was failed, empty or short (nothing lies past these offsets)
+        """
+        done = False
+        future_to_offset = {
+            self.executor.submit(self._fetch_series_page, page_offset, limit): page_offset
+            for page_offset in offsets
+        }
 
-                self.logger.info(f"Fetched {len(series_list)} series (offset: {offset})")
+        for future in as_completed(future_to_offset):
+            page_offset = future_to_offset[future]
+            series_list, _ = future.result()
 
-                offset += limit
+            if not series_list or len(series_list) < limit:
+                done = True
+            if not series_list:
+                continue
 
-                # Rate limiting
-                time.sleep(self.config.RATE_LIMIT_DELAY)
+            all_series.extend(series_list)
 
-                if len(series_list) < limit:
-                    break
+            # Store series
+            self.store_manager._store_series_list(series_list)
 
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"Error fetching series at offset {offset}: {e}")
-                break
-            except Exception as e:
-                self.logger.error(f"Unexpected error: {e}")
-                break
+            self.logger.info(f"Fetched {len(series_list)} series (offset: {page_offset})")
 
-        self.logger.info(f"Total series fetched: {len(all_series)}")
-        return all_series
\ No newline at end of file
+        return done
+
+    def _fetch_series_page(self, offset: int, limit: int) -> Tuple[Optional[List[Dict]], Optional[int]]:
+        """
+        Fetch a single page of series
+        
+        Returns:
+            (series, total) where series is None if the request failed and total is the
+            count from X-Total-Count / Content-Range, or None if the API did not send one
+        """
+        try:
+            url = f"{self.base_url}/series"
+            params = [("limit", limit), ("offset", offset), *_SERIES_PARAMS]
+
+            response = throttled_get(
+                self.session,
+                self.limiter,
+                url,
+                params=params,
+                timeout=self.config.REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+
+            return orjson.loads(response.content) or [], self._parse_total_count(response.headers)
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error fetching series at offset {offset}: {e}")
+            return None, None
+        except Exception as e:
+            self.logger.error(f"Unexpected error: {e}")
+            return None, None
+
+    def _parse_total_count(self, headers) -> Optional[int]:
+        """Read the total item count from X-Total-Count or Content-Range ('items 0-99/1234')"""
+        total = headers.get('X-Total-Count')
+        if total is None:
+            content_range = headers.get('Content-Range', '')
+            total = content_range.rpartition('/')[2] if '/' in content_range else None
+
+        try:
+            return int(total) if total is not None else None
+        except ValueError:
+            return None
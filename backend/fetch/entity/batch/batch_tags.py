@@ -3,6 +3,7 @@ Batch tags
 Handles batch fetching for the tags
 """
 
+import orjson
 import requests
 import json
 from datetime import datetime
@@ -12,16 +13,29 @@ from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_tags import StoreTagsManager
+from backend.fetch.http_pool import SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+from backend.fetch.lru_cache import LRUCache
 
 class BatchTagsManager(DatabaseManager):
     """Manager for batch tag fetching"""
 
-    def __init__(self):
+    def __init__(self, store_manager: StoreTagsManager = None):
         super().__init__()
         self.config = Config
         self.base_url = Config.GAMMA_API_URL
         self._lock = Lock()  # Thread-safe database operations
-        self.store_manager = StoreTagsManager()
+        self.store_manager = store_manager or StoreTagsManager()
+        
+        # Process-wide keep-alive session shared with the other fetchers
+        self.session = SHARED_SESSION
+        
+        # Gamma requests are paced by the limiter shared with every other manager on this host
+        self.limiter = host_limiter(self.base_url)
+        
+        # Responses already fetched (and stored) in the last five minutes, keyed by id
+        self._relationships_cache = LRUCache(maxsize=4096, ttl=300)
+        self._event_tags_cache = LRUCache(maxsize=4096, ttl=300)
         
         # Set max workers
         self.max_workers = min(20, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 20))
@@ -45,15 +59,17 @@ class BatchTagsManager(DatabaseManager):
             url = f"{self.base_url}/tags"
             params = {"limit": limit}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            tags = response.json()
+            # Parse the raw bytes directly instead of decoding to a str first
+            tags = orjson.loads(response.content)
             all_tags.extend(tags)
 
             # Store tags
@@ -72,26 +88,32 @@ class BatchTagsManager(DatabaseManager):
         """
         Fetch relationships for a specific tag
         """
+        cached = self._relationships_cache.get(tag_id)
+        if cached is not None:
+            return cached
+
         try:
             url = f"{self.base_url}/tags/{tag_id}/related-tags"
             params = {"status": "all", "omit_empty": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            relationships = response.json()
+            relationships = orjson.loads(response.content)
 
             if relationships:
                 self.store_manager._store_tag_relationships(relationships)
 
+            self._relationships_cache.put(tag_id, relationships)
             return relationships
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching relationships for tag {tag_id}: {e}")
             return []
 
@@ -99,24 +121,30 @@ class BatchTagsManager(DatabaseManager):
         """
         Fetch tags for a specific event
         """
+        cached = self._event_tags_cache.get(event_id)
+        if cached is not None:
+            return cached
+
         try:
             url = f"{self.base_url}/events/{event_id}/tags"
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 url,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            tags = response.json()
+            tags = orjson.loads(response.content)
             
             # Store tags and relationships
             self.store_manager._fetch_and_store_event_tags(event_id, tags)
             
+            self._event_tags_cache.put(event_id, tags)
             return tags
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching tags for event {event_id}: {e}")
             return []
 
@@ -127,14 +155,15 @@ class BatchTagsManager(DatabaseManager):
         try:
             url = f"{self.base_url}/markets/{market_id}/tags"
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 url,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            tags = response.json()
+            tags = orjson.loads(response.content)
             
             # Store tags and relationships
             if tags:
@@ -142,6 +171,6 @@ class BatchTagsManager(DatabaseManager):
             
             return tags
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching tags for market {market_id}: {e}")
             return []
\ No newline at end of file
@@ -3,15 +3,20 @@ Batch transactions
 Handles batch fetching for the transactions
 """
 
-import time
+import heapq
+import orjson
+from operator import itemgetter
 from typing import Dict, List
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, wait
+from queue import Queue
+from threading import Lock, Thread
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_transactions import StoreTransactionsManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+from backend.fetch.response_cache import cached_get_content
 
 class BatchTransactionsManager(DatabaseManager):
     """Manager for batch transaction fetching"""
@@ -21,15 +26,17 @@ class BatchTransactionsManager(DatabaseManager):
         self.config = Config
         self.clob_api_url = Config.CLOB_API_URL if Config.CLOB_API_URL else "https://clob.polymarket.com"
         self.data_api_url = Config.DATA_API_URL if Config.DATA_API_URL else "https://data-api.polymarket.com"
-        self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreTransactionsManager()
         
-        # Reduce max workers to avoid overwhelming the database
-        self.max_workers = min(5, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 5))
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
         
-        # Thread-safe batch collections
-        self._batch_lock = Lock()
-        self._batch_data = defaultdict(list)
+        # Adaptive request budget shared with every other manager calling the same host
+        self.limiter = host_limiter(self.data_api_url)
+        
+        # Network-bound fan-out on the shared pool, which is sized by HTTP_WORKERS
+        self.max_workers = Config.HTTP_WORKERS
         
         # Progress tracking
         self._progress_lock = Lock()
@@ -46,13 +53,16 @@ class BatchTransactionsManager(DatabaseManager):
         self.logger.info("Fetching recent whale transactions...")
         
         try:
-            # Get recent whale users with activity
+            # Get the 50 wallets with the largest recent whale-sized activity; the unary +
+            # keeps the planner on the idx_activity_size_ts range scan instead of walking
+            # idx_activity_wallet for the GROUP BY
             recent_whales = self.fetch_all("""
-                SELECT DISTINCT proxy_wallet
+                SELECT proxy_wallet, MAX(usdc_size) AS max_usdc_size
                 FROM user_activity
                 WHERE usdc_size >= ?
                 AND timestamp > datetime('now', '-7 days')
-                ORDER BY usdc_size DESC
+                GROUP BY +proxy_wallet
+                ORDER BY max_usdc_size DESC
                 LIMIT 50
             """, (self.MIN_WHALE_TRADE,))
             
@@ -68,10 +78,10 @@ class BatchTransactionsManager(DatabaseManager):
                         "minSize": self.MIN_TRANSACTION_SIZE
                     }
                     
-                    response = requests.get(url, params=params, timeout=30)
+                    response = throttled_get(self.session, host_limiter(url), url, params=params, timeout=30)
                     
                     if response.status_code == 200:
-                        transactions = response.json()
+                        transactions = orjson.loads(response.content)
                         
                         for tx in transactions:
                             usdc_size = tx.get('usdcSize', 0) or (tx.get('size', 0) * tx.get('price', 0))
@@ -81,7 +91,7 @@ class BatchTransactionsManager(DatabaseManager):
                                 all_transactions.append(tx)
                                 
                 except Exception as e:
-                    self.logger.debug(f"Error fetching transactions for whale: {e}")
+                    self.logger.debug("Error fetching transactions for whale: %s", e)
             
             # Bulk insert transactions
             if all_transactions:
@@ -96,44 +106,62 @@ class BatchTransactionsManager(DatabaseManager):
 
     def fetch_user_trades_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch trades for a batch of users"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching trades for {len(users)} users...")
         
-        all_trades = []
+        total_trades = 0
         whale_trades = []
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Process in chunks
-            chunk_size = 50
-            for i in range(0, len(users), chunk_size):
-                chunk = users[i:i+chunk_size]
-                
-                futures = {
-                    executor.submit(self._fetch_user_trades_api, user): user 
-                    for user in chunk
-                }
-                
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        all_trades.extend(result['trades'])
-                        whale_trades.extend(result['whale_trades'])
-                    except Exception as e:
-                        self.logger.debug(f"Error in trades batch: {e}")
-                
-                time.sleep(0.5)
+        # Trades stream to a flusher thread in chunks instead of accumulating for one insert at the end
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_trades, 5000, 1.0),
+                         daemon=True)
+        flusher.start()
+        
+        # Workers only wait on HTTP, so keep a sliding window of requests
+        # in flight on the shared pool with no chunk stalls
+        window = self.max_workers * 2
+        pending = set()
+        
+        for user in users:
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total_trades += self._collect_trade_results(done, row_queue, whale_trades)
+            
+            pending.add(self.executor.submit(self._fetch_user_trades_api, user))
         
-        # Bulk insert trades
-        if all_trades:
-            self.store_manager._bulk_insert_trades(all_trades)
+        done, _ = wait(pending)
+        total_trades += self._collect_trade_results(done, row_queue, whale_trades)
         
         # Also fetch trades for top markets
         market_trades = self._fetch_market_trades()
+        if market_trades:
+            row_queue.put(market_trades)
+            total_trades += len(market_trades)
+        
+        row_queue.put(None)
+        flusher.join()
         
         return {
-            'total_trades': len(all_trades) + market_trades,
+            'total_trades': total_trades,
             'whale_trades': len(whale_trades)
         }
 
+    def _collect_trade_results(self, futures, row_queue: Queue, whale_trades: List[Dict]) -> int:
+        """Queue the trades of finished fetches for the flusher; returns how many were queued"""
+        queued = 0
+        for future in futures:
+            try:
+                result = future.result()
+                if result['trades']:
+                    row_queue.put(result['trades'])
+                    queued += len(result['trades'])
+                whale_trades.extend(result['whale_trades'])
+            except Exception as e:
+                self.logger.debug("Error in trades batch: %s", e)
+        return queued
+
     def _fetch_user_trades_api(self, proxy_wallet: str) -> Dict:
         """Fetch trades for a single user from API"""
         try:
@@ -144,41 +172,40 @@ class BatchTransactionsManager(DatabaseManager):
                 "takerOnly": "false"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            content = cached_get_content(self.session, self.limiter, url, params, timeout=30)
             
-            if response.status_code != 200:
+            if content is None:
                 return {'trades': [], 'whale_trades': []}
             
-            trades = response.json()
+            trades = orjson.loads(content)
             
             if not trades:
                 return {'trades': [], 'whale_trades': []}
             
-            processed_trades = []
-            whale_trades = []
-            
+            # Trades are tagged in place rather than copied into a new list
             for trade in trades:
-                trade_value = trade.get('size', 0) * trade.get('price', 0)
-                
                 trade['proxyWallet'] = proxy_wallet
-                processed_trades.append(trade)
-                
-                # Track whale trades
-                if trade_value > 10000:
-                    whale_trades.append({
-                        'wallet': proxy_wallet,
-                        'value': trade_value,
-                        'side': trade.get('side')
-                    })
             
-            return {'trades': processed_trades, 'whale_trades': whale_trades}
+            # Track whale trades
+            whale_trades = [
+                {'wallet': proxy_wallet, 'value': trade_value, 'side': trade.get('side')}
+                for trade in trades
+                if (trade_value := trade.get('size', 0) * trade.get('price', 0)) > 10000
+            ]
+            
+            return {'trades': trades, 'whale_trades': whale_trades}
+            
+        except requests.exceptions.RetryError as e:
+            # The session already retried 429/5xx with backoff; surface the dropped wallet
+            self.logger.warning(f"⚠️ Gave up fetching trades for {proxy_wallet} after retries: {e}")
+            return {'trades': [], 'whale_trades': []}
             
         except Exception as e:
-            self.logger.debug(f"Error fetching trades for {proxy_wallet}: {e}")
+            self.logger.debug("Error fetching trades for %s: %s", proxy_wallet, e)
             return {'trades': [], 'whale_trades': []}
 
-    def _fetch_market_trades(self) -> int:
-        """Fetch trades for top markets"""
+    def _fetch_market_trades(self) -> List[Dict]:
+        """Fetch significant trades for top markets (stored by the caller)"""
         self.logger.info("Fetching trades for top markets...")
         
         # Get top markets by volume
@@ -191,6 +218,7 @@ class BatchTransactionsManager(DatabaseManager):
         """)
         
         all_trades = []
+        min_size = self.MIN_TRANSACTION_SIZE
         
         for market in markets:
             try:
@@ -200,25 +228,21 @@ class BatchTransactionsManager(DatabaseManager):
                     "limit": "50"
                 }
                 
-                response = requests.get(url, params=params, timeout=30)
+                response = throttled_get(self.session, self.limiter, url, params=params, timeout=30)
                 
                 if response.status_code == 200:
-                    trades = response.json()
+                    trades = orjson.loads(response.content)
                     
-                    for trade in trades:
-                        # Only store significant trades
-                        trade_value = trade.get('size', 0) * trade.get('price', 0)
-                        if trade_value >= self.MIN_TRANSACTION_SIZE:
-                            all_trades.append(trade)
+                    # Only store significant trades
+                    all_trades.extend(
+                        trade for trade in trades
+                        if trade.get('size', 0) * trade.get('price', 0) >= min_size
+                    )
                             
             except Exception as e:
-                self.logger.debug(f"Error fetching market trades: {e}")
+                self.logger.debug("Error fetching market trades: %s", e)
         
-        # Bulk insert market trades
-        if all_trades:
-            self.store_manager._bulk_insert_trades(all_trades)
-        
-        return len(all_trades)
+        return all_trades
 
 
 
@@ -226,35 +250,28 @@ class BatchTransactionsManager(DatabaseManager):
 
     def fetch_user_activity_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch activity for a batch of users"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching activity for {len(users)} users...")
         
-        all_activities = []
+        total_activities = 0
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Process in chunks
-            chunk_size = 50
-            for i in range(0, len(users), chunk_size):
-                chunk = users[i:i+chunk_size]
-                
-                futures = {
-                    executor.submit(self._fetch_user_activity_api, user): user 
-                    for user in chunk
-                }
-                
-                for future in as_completed(futures):
-                    try:
-                        activities = future.result()
-                        all_activities.extend(activities)
-                    except Exception as e:
-                        self.logger.debug(f"Error in activity batch: {e}")
-                
-                time.sleep(0.5)
+        # Activities are inserted by a flusher thread while fetches are still in flight
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_activities, 5000, 1.0),
+                         daemon=True)
+        flusher.start()
+        
+        # The fetch helper catches its own errors, so map streams results without per-chunk stalls
+        for activities in self.executor.map(self._fetch_user_activity_api, users):
+            if activities:
+                row_queue.put(activities)
+                total_activities += len(activities)
         
-        # Bulk insert activities
-        if all_activities:
-            self.store_manager._bulk_insert_activities(all_activities)
+        row_queue.put(None)
+        flusher.join()
         
-        return {'total_activities': len(all_activities)}
+        return {'total_activities': total_activities}
 
     def _fetch_user_activity_api(self, proxy_wallet: str) -> List[Dict]:
         """Fetch activity for a single user from API"""
@@ -267,12 +284,12 @@ class BatchTransactionsManager(DatabaseManager):
                 "sortDirection": "DESC"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            content = cached_get_content(self.session, self.limiter, url, params, timeout=30)
             
-            if response.status_code != 200:
+            if content is None:
                 return []
             
-            activities = response.json()
+            activities = orjson.loads(content)
             
             if not activities:
                 return []
@@ -292,8 +309,12 @@ class BatchTransactionsManager(DatabaseManager):
             
             return filtered_activities
             
+        except requests.exceptions.RetryError as e:
+            self.logger.warning(f"⚠️ Gave up fetching activity for {proxy_wallet} after retries: {e}")
+            return []
+            
         except Exception as e:
-            self.logger.debug(f"Error fetching activity for {proxy_wallet}: {e}")
+            self.logger.debug("Error fetching activity for %s: %s", proxy_wallet, e)
             return []
 
 
@@ -302,38 +323,34 @@ class BatchTransactionsManager(DatabaseManager):
 
     def fetch_user_values_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch portfolio values for a batch of users"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching portfolio values for {len(users)} users...")
         
         values_fetched = 0
         whale_portfolios = []
-        all_values = []
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_user_value_api, user): user 
-                for user in users
-            }
-            
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result['fetched']:
-                        all_values.append(result)
-                        values_fetched += 1
-                        if result['value'] > 50000:
-                            whale_portfolios.append(result)
-                except Exception as e:
-                    self.logger.debug(f"Error in values batch: {e}")
+        # Values (and the matching user totals) are written by a flusher thread as results arrive
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_values, 1000, 1.0),
+                         daemon=True)
+        flusher.start()
         
-        # Bulk insert values
-        if all_values:
-            self.store_manager._bulk_insert_values(all_values)
+        for result in self.executor.map(self._fetch_user_value_api, users):
+            if result['fetched']:
+                row_queue.put([result])
+                values_fetched += 1
+                if result['value'] > 50000:
+                    whale_portfolios.append(result)
         
-        # Display top whale portfolios
-        whale_portfolios.sort(key=lambda x: x['value'], reverse=True)
-        if whale_portfolios[:5]:
+        row_queue.put(None)
+        flusher.join()
+        
+        # Display top whale portfolios (bounded heap instead of a full sort)
+        top_portfolios = heapq.nlargest(5, whale_portfolios, key=itemgetter('value'))
+        if top_portfolios:
             self.logger.info("🐋 Top 5 Whale Portfolios:")
-            for portfolio in whale_portfolios[:5]:
+            for portfolio in top_portfolios:
                 self.logger.info(f"   {portfolio['wallet'][:10]}... - ${portfolio['value']:,.2f}")
         
         return {
@@ -347,12 +364,12 @@ class BatchTransactionsManager(DatabaseManager):
             url = f"{self.data_api_url}/value"
             params = {"user": proxy_wallet}
             
-            response = requests.get(url, params=params, timeout=30)
+            content = cached_get_content(self.session, self.limiter, url, params, timeout=30)
             
-            if response.status_code != 200:
+            if content is None:
                 return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
             
-            value_data = response.json()
+            value_data = orjson.loads(content)
             
             if not value_data or len(value_data) == 0:
                 return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
@@ -361,6 +378,10 @@ class BatchTransactionsManager(DatabaseManager):
             
             return {'fetched': True, 'wallet': proxy_wallet, 'value': total_value}
             
+        except requests.exceptions.RetryError as e:
+            self.logger.warning(f"⚠️ Gave up fetching value for {proxy_wallet} after retries: {e}")
+            return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
+            
         except Exception as e:
-            self.logger.debug(f"Error fetching value for {proxy_wallet}: {e}")
+            self.logger.debug("Error fetching value for %s: %s", proxy_wallet, e)
             return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
\ No newline at end of file
@@ -3,15 +3,21 @@ Batch users
 Handles batch fetching for the users
 """
 
-import time
+import heapq
+import orjson
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Optional, Set
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-import requests
+from typing import Dict, List, Optional
+from concurrent.futures import as_completed
+from queue import Queue
+from threading import Lock, Thread
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_users import StoreUsersManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.lru_cache import LRUCache
+from backend.fetch.rate_limiter import host_limiter, throttled_get
+from backend.fetch.response_cache import cached_get_content
 
 class BatchUsersManager(DatabaseManager):
     """Manager for batch user fetching"""
@@ -22,7 +28,6 @@ class BatchUsersManager(DatabaseManager):
         self.data_api_url = Config.DATA_API_URL
         self.base_url = Config.GAMMA_API_URL
         self.clob_url = Config.CLOB_API_URL
-        self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreUsersManager()
         
         # Whale thresholds
@@ -31,8 +36,16 @@ class BatchUsersManager(DatabaseManager):
         self.TOP_HOLDERS_PER_MARKET = 25  # Top 25 holders per market
         self.MIN_TRANSACTION_SIZE = Config.MIN_TRANSACTION_SIZE if hasattr(Config, 'MIN_TRANSACTION_SIZE') else 500
         
-        # Set max workers
-        self.max_workers = min(10, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 10))
+        # Network-bound fan-out on the process-wide session and pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+        self.max_workers = Config.HTTP_WORKERS
+        
+        # Adaptive request budget shared with every other manager calling the same host
+        self.limiter = host_limiter(self.data_api_url)
+        
+        # Wallet values already fetched this run; whales appear among the holders of many markets
+        self._wallet_value_cache = LRUCache(maxsize=200_000, ttl=Config.WALLET_VALUE_TTL_SECONDS)
         
         # Thread-safe counters and collections
         self._progress_lock = Lock()
@@ -44,6 +57,9 @@ class BatchUsersManager(DatabaseManager):
         """
         Fetch top 25 holders for ALL active markets using multithreading
         Only store users meeting whale criteria ($1000+ wallet OR $250+ position)
+        
+        Runs in phases: holder lists for every market first, then one parallel batch of
+        wallet-value lookups for the distinct holders, then the whale check and storage
         """
         self.logger.info("🐋 Fetching top holders for all active markets with multithreading...")
         
@@ -62,22 +78,75 @@ class BatchUsersManager(DatabaseManager):
         
         self.logger.info(f"Processing {len(markets)} markets using {self.max_workers} threads...")
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_market = {
-                executor.submit(self._fetch_and_filter_market_holders_thread_safe, market, len(markets)): market 
-                for market in markets
-            }
-            
-            # Process completed tasks
-            for future in as_completed(future_to_market):
-                market = future_to_market[future]
-                try:
-                    whale_wallets = future.result()
-                    with self._progress_lock:
-                        self._whale_wallets.update(whale_wallets)
-                except Exception as e:
-                    self.logger.error(f"Error processing market {market['id']}: {e}")
+        # Phase 1: collect holder candidates for every market on the long-lived shared pool
+        future_to_market = {
+            self.executor.submit(self._fetch_and_filter_market_holders_thread_safe, market, len(markets)): market 
+            for market in markets
+        }
+        
+        candidates = []
+        for future in as_completed(future_to_market):
+            market = future_to_market[future]
+            try:
+                candidates.extend(future.result())
+            except Exception as e:
+                self.logger.error(f"Error processing market {market['id']}: {e}")
+        
+        # Phase 2: look up each distinct wallet once, all in parallel. Holders whose position
+        # alone clears MIN_POSITION_VALUE are whales either way, so they need no lookup
+        unique_wallets = list({
+            candidate['proxy_wallet'] for candidate in candidates
+            if candidate['position_value'] < self.MIN_POSITION_VALUE
+        })
+        self.logger.info(f"Fetching wallet values for {len(unique_wallets)} unique holders...")
+        wallet_values = dict(zip(unique_wallets, self.executor.map(self._fetch_user_wallet_value, unique_wallets)))
+        
+        # Phase 3: apply whale criteria and stage records
+        now = datetime.now().isoformat()
+        user_records = {}
+        unvalued_records = {}
+        holder_records = []
+        
+        for candidate in candidates:
+            wallet = candidate['proxy_wallet']
+            wallet_value = wallet_values.get(wallet)
+            user_data = self._apply_wallet_value(candidate, wallet_value or 0, now)
+            if not user_data:
+                continue
+            
+            if wallet_value is None:
+                # Skipped lookup: leave total_value out so a stored one is kept; the values stage refreshes it
+                del user_data['total_value']
+                unvalued_records[wallet] = user_data
+            else:
+                user_records[wallet] = user_data
+            
+            # Holder fields can be absent, so a bound .get (not itemgetter) reads them
+            get = candidate['holder'].get
+            holder_records.append({
+                'market_id': candidate['market_id'],
+                'token_id': candidate['token_id'],
+                'proxy_wallet': wallet,
+                'username': get('name'),
+                'pseudonym': get('pseudonym'),
+                'amount': get('amount', 0),
+                'outcome_index': candidate['outcome_index'],
+                'bio': get('bio'),
+                'profile_image': get('profileImage'),
+                'updated_at': now
+            })
+        
+        self._whale_wallets = set(user_records) | set(unvalued_records)
+        
+        # Phase 4: store whales and their holdings in one transaction
+        try:
+            self.bulk_write([
+                ('users', list(user_records.values()), 'REPLACE'),
+                ('users', list(unvalued_records.values()), 'UPDATE', 'proxy_wallet'),
+                ('market_holders', holder_records, 'REPLACE')
+            ])
+        except Exception as e:
+            self.logger.error(f"Error storing market holders: {e}")
         
         self.logger.info(f"✅ Found {len(self._whale_wallets)} whale users across {self._progress_counter} markets")
         
@@ -86,28 +155,25 @@ class BatchUsersManager(DatabaseManager):
             'total_whales_found': len(self._whale_wallets)
         }
 
-    def _fetch_and_filter_market_holders_thread_safe(self, market: Dict, total_markets: int) -> Set[str]:
-        """Thread-safe wrapper for fetching and filtering market holders"""
+    def _fetch_and_filter_market_holders_thread_safe(self, market: Dict, total_markets: int) -> List[Dict]:
+        """Thread-safe wrapper for fetching a market's holder candidates"""
         try:
-            whale_wallets = self._fetch_and_filter_market_holders(market['id'], market['condition_id'])
+            candidates = self._fetch_and_filter_market_holders(market['id'], market['condition_id'])
             
             with self._progress_lock:
                 self._progress_counter += 1
                 if self._progress_counter % 10 == 0:
-                    self.logger.info(f"  Processed {self._progress_counter}/{total_markets} markets, found {len(self._whale_wallets)} unique whales")
-            
-            # Rate limiting
-            time.sleep(self.config.RATE_LIMIT_DELAY / self.max_workers)
+                    self.logger.info(f"  Processed {self._progress_counter}/{total_markets} markets")
             
-            return whale_wallets
+            return candidates
             
         except Exception as e:
             with self._progress_lock:
                 self._error_counter += 1
             raise e
 
-    def _fetch_and_filter_market_holders(self, market_id: str, condition_id: str) -> Set[str]:
-        """Fetch top holders for a specific market and filter by whale criteria"""
+    def _fetch_and_filter_market_holders(self, market_id: str, condition_id: str) -> List[Dict]:
+        """Fetch top holders for a specific market as whale candidates (wallet values are checked later)"""
         try:
             # Fetch market holders using DATA API
             url = f"{self.data_api_url}/holders"
@@ -117,23 +183,23 @@ class BatchUsersManager(DatabaseManager):
                 "limit": 100
             }
             
-            response = requests.get(
+            content = cached_get_content(
+                self.session,
+                self.limiter,
                 url,
-                params=params,
-                headers=self.config.get_api_headers(),
+                params,
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
-            if response.status_code != 200:
-                return set()
+            if content is None:
+                return []
             
-            holders_data = response.json()
+            holders_data = orjson.loads(content)
             
             if not holders_data:
-                return set()
+                return []
             
-            whale_wallets = set()
-            holder_records = []
+            candidates = []
             
             # Process all token groups (YES/NO outcomes)
             for token_group in holders_data:
@@ -141,102 +207,84 @@ class BatchUsersManager(DatabaseManager):
                 holders = token_group.get('holders', [])
                 outcome_index = token_group.get('outcomeIndex', 0)
                 
-                # Process each holder
                 for holder in holders[:self.TOP_HOLDERS_PER_MARKET]:
-                    proxy_wallet = holder.get('proxyWallet')
-                    if not proxy_wallet:
-                        continue
-                    
-                    # Check if meets whale criteria
-                    is_whale, user_data = self._check_whale_criteria_from_holder(holder, market_id)
-                    
-                    if is_whale:
-                        whale_wallets.add(proxy_wallet)
-                        
-                        # Store user data
-                        if user_data:
-                            with self._lock:
-                                self.store_manager._store_user(user_data)
-                        
-                        # Store holder record
-                        holder_record = {
-                            'market_id': market_id,
-                            'token_id': token_id,
-                            'proxy_wallet': proxy_wallet,
-                            'username': holder.get('name'),
-                            'pseudonym': holder.get('pseudonym'),
-                            'amount': holder.get('amount', 0),
-                            'outcome_index': outcome_index,
-                            'bio': holder.get('bio'),
-                            'profile_image': holder.get('profileImage'),
-                            'updated_at': datetime.now().isoformat()
-                        }
-                        holder_records.append(holder_record)
-            
-            # Bulk insert holders
-            if holder_records:
-                with self._lock:
-                    self.bulk_insert_or_replace('market_holders', holder_records)
-            
-            return whale_wallets
+                    candidate = self._prepare_candidate(holder, market_id, token_id, outcome_index)
+                    if candidate:
+                        candidates.append(candidate)
+            
+            return candidates
             
         except Exception as e:
             self.logger.error(f"Error fetching holders for market {market_id}: {e}")
-            return set()
+            return []
 
-    def _check_whale_criteria_from_holder(self, holder: Dict, market_id: str) -> tuple[bool, Optional[Dict]]:
-        """Check if holder meets whale criteria"""
+    def _prepare_candidate(self, holder: Dict, market_id: str, token_id: str, outcome_index: int) -> Optional[Dict]:
+        """Wrap a holder entry as a whale candidate (no HTTP), or None if it has no wallet"""
         proxy_wallet = holder.get('proxyWallet')
+        if not proxy_wallet:
+            return None
         
-        # Get wallet value
-        wallet_value = self._fetch_user_wallet_value(proxy_wallet)
-        
-        # Check position value
-        position_shares = holder.get('amount', 0)
-        estimated_position_value = position_shares * 0.5  # Conservative estimate
+        return {
+            'proxy_wallet': proxy_wallet,
+            'market_id': market_id,
+            'token_id': token_id,
+            'outcome_index': outcome_index,
+            'position_value': holder.get('amount', 0) * 0.5,  # Conservative estimate
+            'holder': holder
+        }
+
+    def _apply_wallet_value(self, candidate: Dict, wallet_value: float, now: str) -> Optional[Dict]:
+        """Check a candidate against the whale criteria; returns its user record, or None if not a whale"""
+        get = candidate['holder'].get
+        position_shares = get('amount', 0)
         
         # Check whale criteria
         is_whale = (
             wallet_value >= self.MIN_WALLET_VALUE or 
-            estimated_position_value >= self.MIN_POSITION_VALUE or
+            candidate['position_value'] >= self.MIN_POSITION_VALUE or
             (wallet_value >= 500 and position_shares >= 100)
         )
         
         if not is_whale:
-            return False, None
+            return None
         
         # Prepare user record
-        user_data = {
-            'proxy_wallet': proxy_wallet,
-            'username': holder.get('name'),
-            'pseudonym': holder.get('pseudonym'),
-            'bio': holder.get('bio'),
-            'profile_image': holder.get('profileImage'),
-            'profile_image_optimized': holder.get('profileImageOptimized'),
+        return {
+            'proxy_wallet': candidate['proxy_wallet'],
+            'username': get('name'),
+            'pseudonym': get('pseudonym'),
+            'bio': get('bio'),
+            'profile_image': get('profileImage'),
+            'profile_image_optimized': get('profileImageOptimized'),
             'total_value': wallet_value,
             'is_whale': 1,
-            'last_updated': datetime.now().isoformat(),
-            'created_at': datetime.now().isoformat()
+            'last_updated': now,
+            'created_at': now
         }
-        
-        return True, user_data
 
     def _fetch_user_wallet_value(self, proxy_wallet: str) -> float:
-        """Fetch user's total wallet value"""
+        """Fetch user's total wallet value (cached per wallet for WALLET_VALUE_TTL_SECONDS)"""
+        cached = self._wallet_value_cache.get(proxy_wallet)
+        if cached is not None:
+            return cached
+        
         try:
             url = f"{self.data_api_url}/portfolio-value"
             params = {"user": proxy_wallet}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self.limiter,
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                data = response.json()
-                return data.get('totalValue', 0) if data else 0
+                data = orjson.loads(response.content)
+                wallet_value = data.get('totalValue', 0) if data else 0
+                self._wallet_value_cache.put(proxy_wallet, wallet_value)
+                return wallet_value
             
             return 0
             
@@ -245,35 +293,28 @@ class BatchUsersManager(DatabaseManager):
 
     def fetch_user_activity_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch detailed activity for a batch of users"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching activity for {len(users)} users...")
         
-        all_activities = []
+        total_activities = 0
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Process in chunks
-            chunk_size = 50
-            for i in range(0, len(users), chunk_size):
-                chunk = users[i:i+chunk_size]
-                
-                futures = {
-                    executor.submit(self._fetch_user_activity_api, user): user 
-                    for user in chunk
-                }
-                
-                for future in as_completed(futures):
-                    try:
-                        activities = future.result()
-                        all_activities.extend(activities)
-                    except Exception as e:
-                        self.logger.debug(f"Error in activity batch: {e}")
-                
-                time.sleep(0.5)
+        # Activities are inserted by a flusher thread while fetches are still in flight
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_activities, 5000, 1.0),
+                         daemon=True)
+        flusher.start()
         
-        # Bulk insert all activities
-        if all_activities:
-            self.store_manager._bulk_insert_activities(all_activities)
+        # _fetch_user_activity_api never raises, so map can stream every user with no chunk barriers
+        for activities in self.executor.map(self._fetch_user_activity_api, users):
+            if activities:
+                row_queue.put(activities)
+                total_activities += len(activities)
         
-        return {'total_activities': len(all_activities)}
+        row_queue.put(None)
+        flusher.join()
+        
+        return {'total_activities': total_activities}
 
     def _fetch_user_activity_api(self, proxy_wallet: str) -> List[Dict]:
         """Fetch activity for a single user from API"""
@@ -286,12 +327,12 @@ class BatchUsersManager(DatabaseManager):
                 "sortDirection": "DESC"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            content = cached_get_content(self.session, self.limiter, url, params, timeout=30)
             
-            if response.status_code != 200:
+            if content is None:
                 return []
             
-            activities = response.json()
+            activities = orjson.loads(content)
             
             if not activities:
                 return []
@@ -312,43 +353,39 @@ class BatchUsersManager(DatabaseManager):
             return filtered_activities
             
         except Exception as e:
-            self.logger.debug(f"Error fetching activity for {proxy_wallet}: {e}")
+            self.logger.debug("Error fetching activity for %s: %s", proxy_wallet, e)
             return []
 
     def fetch_user_values_batch(self, users: List[str]) -> Dict[str, int]:
         """Fetch portfolio values for a batch of users"""
+        users = list(dict.fromkeys(users))
         self.logger.info(f"Fetching portfolio values for {len(users)} users...")
         
         values_fetched = 0
         whale_portfolios = []
-        all_values = []
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_user_value_api, user): user 
-                for user in users
-            }
-            
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result['fetched']:
-                        all_values.append(result)
-                        values_fetched += 1
-                        if result['value'] > 50000:
-                            whale_portfolios.append(result)
-                except Exception as e:
-                    self.logger.debug(f"Error in values batch: {e}")
-        
-        # Bulk insert values
-        if all_values:
-            self.store_manager._bulk_insert_values(all_values)
-        
-        # Display top whale portfolios
-        whale_portfolios.sort(key=lambda x: x['value'], reverse=True)
-        if whale_portfolios[:5]:
+        # Values (and the matching user totals) are written by a flusher thread as results arrive
+        row_queue = Queue(maxsize=1000)
+        flusher = Thread(target=self._drain_and_insert,
+                         args=(row_queue, self.store_manager._bulk_insert_values, 1000, 1.0),
+                         daemon=True)
+        flusher.start()
+        
+        for result in self.executor.map(self._fetch_user_value_api, users):
+            if result['fetched']:
+                row_queue.put([result])
+                values_fetched += 1
+                if result['value'] > 50000:
+                    whale_portfolios.append(result)
+        
+        row_queue.put(None)
+        flusher.join()
+        
+        # Display top whale portfolios (bounded heap instead of a full sort)
+        top_portfolios = heapq.nlargest(5, whale_portfolios, key=itemgetter('value'))
+        if top_portfolios:
             self.logger.info("🐋 Top 5 Whale Portfolios:")
-            for portfolio in whale_portfolios[:5]:
+            for portfolio in top_portfolios:
                 self.logger.info(f"   {portfolio['wallet'][:10]}... - ${portfolio['value']:,.2f}")
         
         return {
@@ -362,12 +399,12 @@ class BatchUsersManager(DatabaseManager):
             url = f"{self.data_api_url}/value"
             params = {"user": proxy_wallet}
             
-            response = requests.get(url, params=params, timeout=30)
+            content = cached_get_content(self.session, self.limiter, url, params, timeout=30)
             
-            if response.status_code != 200:
+            if content is None:
                 return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
             
-            value_data = response.json()
+            value_data = orjson.loads(content)
             
             if not value_data or len(value_data) == 0:
                 return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
@@ -377,5 +414,5 @@ class BatchUsersManager(DatabaseManager):
             return {'fetched': True, 'wallet': proxy_wallet, 'value': total_value}
             
         except Exception as e:
-            self.logger.debug(f"Error fetching value for {proxy_wallet}: {e}")
+            self.logger.debug("Error fetching value for %s: %s", proxy_wallet, e)
             return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
\ No newline at end of file
@@ -3,15 +3,17 @@ ID comments
 Handles individual fetching for the comments of markets and events
 """
 
-import requests
+import orjson
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_comments import StoreCommentsManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.lru_cache import LRUCache
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdCommentsManager(DatabaseManager):
     """Manager for individual comment fetching"""
@@ -20,9 +22,20 @@ class IdCommentsManager(DatabaseManager):
         super().__init__()
         self.config = Config
         self.base_url = Config.GAMMA_API_URL
-        self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreCommentsManager()
         
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+        
+        # Reactions already fetched recently, keyed by comment id; overlapping entity fetches share comments
+        self._reactions_cache = LRUCache(maxsize=10_000, ttl=300)
+        
+        # URLs and the Gamma limiter are resolved once rather than on every per-comment request
+        self._comments_url = f"{self.base_url}/comments"
+        self._reactions_url = f"{self.base_url}/comments/{{}}/reactions".format
+        self._limiter = host_limiter(self.base_url)
+        
         # Set max workers
         self.max_workers = min(10, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 10))
         
@@ -48,63 +61,85 @@ class IdCommentsManager(DatabaseManager):
         self._comments_counter = 0
         self._reactions_counter = 0
         
-        if events:
-            for event_id in events:
-                comments = self._fetch_comments('Event', event_id, limit)
-                if comments:
-                    with self._lock:
-                        self.store_manager._store_comments(comments, event_id=event_id)
-                    self._comments_counter += len(comments)
-                    
-                    for comment in comments:
-                        reactions = self._fetch_comment_reactions(comment['id'])
-                        if reactions:
-                            with self._lock:
-                                self.store_manager._store_comment_reactions(comment['id'], reactions)
-                            self._reactions_counter += len(reactions)
+        # (parentEntityType, event_id, market_id) for every requested entity
+        targets = [('Event', event_id, None) for event_id in events or []]
+        targets += [('market', None, market_id) for market_id in markets or []]
         
-        if markets:
-            for market_id in markets:
-                comments = self._fetch_comments('market', market_id, limit)
-                if comments:
-                    with self._lock:
-                        self.store_manager._store_comments(comments, market_id=market_id)
-                    self._comments_counter += len(comments)
-                    
-                    for comment in comments:
-                        reactions = self._fetch_comment_reactions(comment['id'])
-                        if reactions:
-                            with self._lock:
-                                self.store_manager._store_comment_reactions(comment['id'], reactions)
-                            self._reactions_counter += len(reactions)
+        # Fetch every entity's comments first, then store them all in one transaction
+        results = self.executor.map(
+            lambda target: self._fetch_comments(target[0], target[1] or target[2], limit),
+            targets
+        )
+        comments_by_entity = [
+            (event_id, market_id, comments)
+            for (_, event_id, market_id), comments in zip(targets, results) if comments
+        ]
+        
+        stored_comments = [
+            comment
+            for _, _, comments in self._store_comments_by_entity(comments_by_entity)
+            for comment in comments
+        ]
+        if stored_comments:
+            self._comments_counter = len(stored_comments)
+            
+            # Reactions for every stored comment are fetched concurrently and stored together
+            reactions_by_comment = self._fetch_comments_reactions_parallel(stored_comments)
+            try:
+                self.store_manager._store_comment_reactions_bulk(reactions_by_comment)
+                self._reactions_counter = sum(len(reactions) for _, reactions in reactions_by_comment)
+            except Exception as e:
+                self.logger.error(f"Error storing comment reactions: {e}")
         
         return {
             'comments_fetched': self._comments_counter,
             'reactions_fetched': self._reactions_counter
         }
 
+    def _store_comments_by_entity(self, comments_by_entity: List[Tuple[str, str, List[Dict]]]) -> List[Tuple[str, str, List[Dict]]]:
+        """Store every entity's comments in one transaction; returns the (event_id, market_id, comments) entries stored"""
+        if not comments_by_entity:
+            return []
+        
+        try:
+            self.store_manager._store_comments_bulk(comments_by_entity)
+            return comments_by_entity
+        except Exception:
+            # Fall back to per-entity writes so one bad entity doesn't drop the whole batch
+            stored = []
+            for event_id, market_id, comments in comments_by_entity:
+                try:
+                    self.store_manager._store_comments(comments, event_id=event_id, market_id=market_id)
+                    stored.append((event_id, market_id, comments))
+                except Exception as e:
+                    entity = f"event {event_id}" if event_id else f"market {market_id}"
+                    self.logger.error(f"Error storing comments for {entity}: {e}")
+            return stored
+
     def fetch_user_comments(self, proxy_wallet: str) -> List[Dict]:
         """Fetch user's comments"""
         try:
-            url = f"{self.base_url}/comments"
+            url = self._comments_url
             params = {"userAddress": proxy_wallet, "limit": 100}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self._limiter,
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                comments = response.json() or []
+                comments = orjson.loads(response.content) or []
                 
                 if comments:
-                    with self._lock:
-                        self.store_manager._store_user_comments(comments)
+                    self.store_manager._store_user_comments(comments)
                     
                     # Fetch reactions for each comment (in parallel within this method)
-                    self._fetch_comments_reactions_parallel(comments)
+                    self.store_manager._store_comment_reactions_bulk(
+                        self._fetch_comments_reactions_parallel(comments)
+                    )
                 
                 return comments
             
@@ -114,33 +149,26 @@ class IdCommentsManager(DatabaseManager):
             self.logger.error(f"Error fetching user comments for {proxy_wallet}: {e}")
             return []
 
-    def _fetch_comments_reactions_parallel(self, comments: List[Dict]):
-        """Fetch reactions for multiple comments in parallel"""
-        if not comments:
-            return
+    def _fetch_comments_reactions_parallel(self, comments: List[Dict]) -> List[Tuple[str, List[Dict]]]:
+        """Fetch reactions for multiple comments in parallel; returns (comment_id, reactions) for comments that have any"""
+        # Gamma has no bulk reactions endpoint; skip comments whose payload reports zero reactions
+        comment_ids = [
+            comment.get('id') for comment in comments
+            if comment.get('id') and comment.get('reactionCount') != 0
+        ]
+        if not comment_ids:
+            return []
         
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                executor.submit(self._fetch_comment_reactions, comment.get('id')): comment 
-                for comment in comments if comment.get('id')
-            }
-            
-            for future in as_completed(futures):
-                try:
-                    reactions = future.result()
-                    comment = futures[future]
-                    if reactions:
-                        with self._lock:
-                            self.store_manager._store_comment_reactions(comment.get('id'), reactions)
-                except Exception as e:
-                    self.logger.error(f"Error fetching comment reactions: {e}")
+        # _fetch_comment_reactions never raises, so map can be consumed directly
+        results = self.executor.map(self._fetch_comment_reactions, comment_ids)
+        return [(comment_id, reactions) for comment_id, reactions in zip(comment_ids, results) if reactions]
 
     def _fetch_comments(self, parent_entity_type: str, parent_entity_id: str, limit: int) -> List[Dict]:
         """
         Fetch comments for a specific entity (event or market)
         """
         try:
-            url = f"{self.base_url}/comments"
+            url = self._comments_url
             params = {
                 "parentEntityType": parent_entity_type,
                 "parentEntityId": parent_entity_id,
@@ -148,15 +176,16 @@ class IdCommentsManager(DatabaseManager):
                 "order": "newest"
             }
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self._limiter,
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                return response.json() or []
+                return orjson.loads(response.content) or []
             return []
             
         except Exception as e:
@@ -164,18 +193,25 @@ class IdCommentsManager(DatabaseManager):
             return []
 
     def _fetch_comment_reactions(self, comment_id: str) -> List[Dict]:
-        """Fetch reactions for a specific comment"""
+        """Fetch reactions for a specific comment (cached per comment for a few minutes)"""
+        cached = self._reactions_cache.get(comment_id)
+        if cached is not None:
+            return cached
+        
         try:
-            url = f"{self.base_url}/comments/{comment_id}/reactions"
+            url = self._reactions_url(comment_id)
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                self._limiter,
                 url,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                return response.json() or []
+                reactions = orjson.loads(response.content) or []
+                self._reactions_cache.put(comment_id, reactions)
+                return reactions
             
             return []
             
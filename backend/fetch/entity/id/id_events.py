@@ -3,9 +3,13 @@ ID events fetcher
 Handles individual event fetching operations from Polymarket API
 """
 
+import orjson
 from typing import Dict, List, Optional
 import requests
 import logging
+from backend.fetch.http_pool import SHARED_SESSION
+from backend.fetch.lru_cache import LRUCache
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdEventsFetcher:
     """Handles individual event fetching operations"""
@@ -15,6 +19,17 @@ class IdEventsFetcher:
         self.base_url = base_url
         self.data_api_url = data_api_url
         self.logger = logging.getLogger(self.__class__.__name__)
+        
+        # Process-wide keep-alive session shared with the other fetchers
+        self.session = SHARED_SESSION
+        
+        # Event tags already fetched recently, keyed by event id
+        self._event_tags_cache = LRUCache(maxsize=10_000, ttl=300)
+        
+        # URL builders bound once instead of rebuilding the base on every request
+        self._event_url = f"{self.base_url}/events/{{}}".format
+        self._event_volume_url = f"{self.data_api_url}/events/{{}}/volume".format
+        self._event_tags_url = f"{self.base_url}/events/{{}}/tags".format
 
     def fetch_event_by_id(self, event_id: str) -> Optional[Dict]:
         """
@@ -27,25 +42,26 @@ class IdEventsFetcher:
             Event dictionary or None if failed
         """
         try:
-            url = f"{self.base_url}/events/{event_id}"
+            url = self._event_url(event_id)
             params = {
                 "include_chat": "true",
                 "include_template": "true"
             }
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            event = response.json()
+            event = orjson.loads(response.content)
             self.logger.debug(f"Successfully fetched event: {event_id}")
             return event
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching event {event_id}: {e}")
             return None
 
@@ -63,20 +79,21 @@ class IdEventsFetcher:
             return None
             
         try:
-            url = f"{self.data_api_url}/events/{event_id}/volume"
+            url = self._event_volume_url(event_id)
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            volume_data = response.json()
+            volume_data = orjson.loads(response.content)
             self.logger.debug(f"Successfully fetched live volume for event: {event_id}")
             return volume_data
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching live volume for event {event_id}: {e}")
             return None
 
@@ -92,21 +109,28 @@ class IdEventsFetcher:
         """
         if not self.config.FETCH_TAGS:
             return []
+        
+        cached = self._event_tags_cache.get(event_id)
+        if cached is not None:
+            return cached
             
         try:
-            url = f"{self.base_url}/events/{event_id}/tags"
+            url = self._event_tags_url(event_id)
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
-            tags = response.json()
+            tags = orjson.loads(response.content) or []
             self.logger.debug(f"Successfully fetched {len(tags)} tags for event: {event_id}")
-            return tags if tags else []
             
-        except requests.exceptions.RequestException as e:
+            self._event_tags_cache.put(event_id, tags)
+            return tags
+            
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching tags for event {event_id}: {e}")
             return []
\ No newline at end of file
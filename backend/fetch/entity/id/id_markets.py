@@ -3,13 +3,16 @@ ID markets
 Handles individual fetching for the markets
 """
 
+import orjson
 from typing import Optional, Dict, List
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, wait
 from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_markets import StoreMarketsManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdMarketsManager(DatabaseManager):
     """Manager for individual market fetching"""
@@ -22,6 +25,14 @@ class IdMarketsManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreMarketsManager()
         
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+        
+        # Store/open-interest sub-tasks of fetch_market_by_id_parallel still running in the background
+        self._pending_subtasks = set()
+        self._pending_lock = Lock()
+        
         # Thread-safe counters
         self._progress_lock = Lock()
         self._progress_counter = 0
@@ -38,15 +49,16 @@ class IdMarketsManager(DatabaseManager):
             url = f"{self.base_url}/markets/{market_id}"
             params = {"include_tag": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            market = response.json()
+            market = orjson.loads(response.content)
 
             # Store the detailed market
             self.store_manager._store_market_detailed(market)
@@ -61,7 +73,7 @@ class IdMarketsManager(DatabaseManager):
 
             return market
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching market {market_id}: {e}")
             return None
 
@@ -75,48 +87,65 @@ class IdMarketsManager(DatabaseManager):
             url = f"{self.base_url}/markets/{market_id}"
             params = {"include_tag": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            market = response.json()
-
-            # Parallel execution of sub-tasks
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                futures = []
+            market = orjson.loads(response.content)
 
-                # Store market details
-                futures.append(executor.submit(self.store_manager._store_market_detailed, market))
+            # Sub-tasks run in the background; the caller only needs the market payload
+            futures = []
 
-                # Fetch tags if present
-                if 'tags' in market:
-                    futures.append(executor.submit(self._store_market_tags, market_id, market['tags']))
+            # Store market details
+            futures.append(self.executor.submit(self.store_manager._store_market_detailed, market))
 
-                # Fetch open interest if enabled
-                if self.config.FETCH_OPEN_INTEREST and market.get('conditionId'):
-                    futures.append(executor.submit(
-                        self.fetch_market_open_interest,
-                        market_id,
-                        market.get('conditionId')
-                    ))
+            # Fetch tags if present
+            if 'tags' in market:
+                futures.append(self.executor.submit(self._store_market_tags, market_id, market['tags']))
 
-                # Wait for all to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        self.logger.error(f"Error in parallel market fetch subtask: {e}")
+            # Fetch open interest if enabled
+            if self.config.FETCH_OPEN_INTEREST and market.get('conditionId'):
+                futures.append(self.executor.submit(
+                    self.fetch_market_open_interest,
+                    market_id,
+                    market.get('conditionId')
+                ))
+
+            with self._pending_lock:
+                self._pending_subtasks.update(futures)
+            for future in futures:
+                future.add_done_callback(self._on_subtask_done)
 
             return market
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching market {market_id}: {e}")
             return None
 
+    def _on_subtask_done(self, future: Future):
+        """Stop tracking a finished background sub-task, logging it if it failed"""
+        with self._pending_lock:
+            self._pending_subtasks.discard(future)
+
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Error in parallel market fetch subtask: {future.exception()}")
+
+    def wait_for_subtasks(self):
+        """Block until every background sub-task started by fetch_market_by_id_parallel has finished"""
+        with self._pending_lock:
+            pending = list(self._pending_subtasks)
+        wait(pending)
+
+    def close_connection(self):
+        """Let background sub-tasks finish their writes, then close the read connection"""
+        self.wait_for_subtasks()
+        super().close_connection()
+
     def _store_market_tags(self, market_id: str, tags: List):
         """
         Store tags for a market
@@ -3,12 +3,14 @@ ID positions
 Handles individual fetching for the positions
 """
 
+import orjson
 from threading import Lock
 from typing import Dict, List
-import requests
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_positions import StorePositionsManager
+from backend.fetch.http_pool import SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdPositionsManager(DatabaseManager):
     """Manager for individual position fetching"""
@@ -21,6 +23,9 @@ class IdPositionsManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StorePositionsManager()
         
+        # Process-wide keep-alive session shared with the other fetchers
+        self.session = SHARED_SESSION
+        
         # Set max workers
         self.max_workers = min(20, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 20))
         
@@ -38,15 +43,16 @@ class IdPositionsManager(DatabaseManager):
             url = f"{self.data_api_url}/positions"
             params = {"user": proxy_wallet, "status": "ACTIVE"}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                positions = response.json() or []
+                positions = orjson.loads(response.content) or []
                 if positions:
                     with self._lock:
                         self.store_manager._store_user_current_positions(proxy_wallet, positions)
@@ -64,15 +70,16 @@ class IdPositionsManager(DatabaseManager):
             url = f"{self.data_api_url}/positions"
             params = {"user": proxy_wallet, "status": "CLOSED", "limit": 100}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                positions = response.json() or []
+                positions = orjson.loads(response.content) or []
                 if positions:
                     with self._lock:
                         self.store_manager._store_user_closed_positions(proxy_wallet, positions)
@@ -96,12 +103,12 @@ class IdPositionsManager(DatabaseManager):
                 "sortDirection": "DESC"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, host_limiter(url), url, params=params, timeout=30)
             
             if response.status_code != 200:
                 return {'positions': [], 'whale_positions': []}
             
-            positions = response.json()
+            positions = orjson.loads(response.content)
             
             if not positions:
                 return {'positions': [], 'whale_positions': []}
@@ -155,12 +162,12 @@ class IdPositionsManager(DatabaseManager):
                 "sortDirection": "DESC"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, host_limiter(url), url, params=params, timeout=30)
             
             if response.status_code != 200:
                 return {'positions': [], 'winners': [], 'losers': []}
             
-            closed_positions = response.json()
+            closed_positions = orjson.loads(response.content)
             
             if not closed_positions:
                 return {'positions': [], 'winners': [], 'losers': []}
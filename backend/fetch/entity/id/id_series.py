@@ -3,13 +3,16 @@ ID series
 Handles individual fetching for the series
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
+from concurrent.futures import as_completed
 from typing import Dict, Optional
 import requests
 from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_series import StoreSeriesManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdSeriesManager(DatabaseManager):
     """Manager for individual series fetching"""
@@ -21,6 +24,10 @@ class IdSeriesManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreSeriesManager()
         
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+        
         # Thread-safe counters
         self._progress_lock = Lock()
         self._progress_counter = 0
@@ -37,15 +44,16 @@ class IdSeriesManager(DatabaseManager):
             url = f"{self.base_url}/series/{series_id}"
             params = {"include_chat": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            series = response.json()
+            series = orjson.loads(response.content)
 
             # Store detailed series
             self.store_manager._store_series_detailed(series)
@@ -60,7 +68,7 @@ class IdSeriesManager(DatabaseManager):
 
             return series
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching series {series_id}: {e}")
             return None
 
@@ -73,48 +81,48 @@ class IdSeriesManager(DatabaseManager):
             url = f"{self.base_url}/series/{series_id}"
             params = {"include_chat": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            series = response.json()
+            series = orjson.loads(response.content)
 
             # Parallel execution of sub-tasks
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                futures = []
-
-                # Store series details
-                futures.append(executor.submit(self.store_manager._store_series_detailed, series))
-
-                # Process events if present
-                if 'events' in series:
-                    futures.append(executor.submit(
-                        self.store_manager._store_series_events,
-                        series_id,
-                        series['events']
-                    ))
-
-                # Process collections if present
-                if 'collections' in series:
-                    futures.append(executor.submit(
-                        self.store_manager._store_series_collections,
-                        series_id,
-                        series['collections']
-                    ))
-
-                # Wait for all to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        self.logger.error(f"Error in parallel series fetch subtask: {e}")
+            futures = []
+
+            # Store series details
+            futures.append(self.executor.submit(self.store_manager._store_series_detailed, series))
+
+            # Process events if present
+            if 'events' in series:
+                futures.append(self.executor.submit(
+                    self.store_manager._store_series_events,
+                    series_id,
+                    series['events']
+                ))
+
+            # Process collections if present
+            if 'collections' in series:
+                futures.append(self.executor.submit(
+                    self.store_manager._store_series_collections,
+                    series_id,
+                    series['collections']
+                ))
+
+            # Wait for all to complete
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"Error in parallel series fetch subtask: {e}")
 
             return series
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching series {series_id}: {e}")
             return None
\ No newline at end of file
@@ -3,23 +3,30 @@ ID tags
 Handles individual fetching for the tags
 """
 
+import orjson
 from typing import Dict, List, Optional
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_tags import StoreTagsManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdTagsManager(DatabaseManager):
     """Manager for individual tag fetching"""
 
-    def __init__(self):
+    def __init__(self, store_manager: StoreTagsManager = None):
         super().__init__()
         self.config = Config
         self.base_url = Config.GAMMA_API_URL
         self._lock = Lock()  # Thread-safe database operations
-        self.store_manager = StoreTagsManager()
+        self.store_manager = store_manager or StoreTagsManager()
+        
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
         
         # Set max workers
         self.max_workers = min(20, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 20))
@@ -38,22 +45,23 @@ class IdTagsManager(DatabaseManager):
             url = f"{self.base_url}/tags/{tag_id}"
             params = {"include_template": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            tag = response.json()
+            tag = orjson.loads(response.content)
 
             # Store detailed tag
             self.store_manager._store_tag_detailed(tag)
 
             return tag
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching tag {tag_id}: {e}")
             return None
 
@@ -66,47 +74,47 @@ class IdTagsManager(DatabaseManager):
             url = f"{self.base_url}/tags/{tag_id}"
             params = {"include_template": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            tag = response.json()
+            tag = orjson.loads(response.content)
 
             # Parallel execution of sub-tasks
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                futures = []
+            futures = []
 
-                # Store tag details
-                futures.append(executor.submit(self.store_manager._store_tag_detailed, tag))
+            # Store tag details
+            futures.append(self.executor.submit(self.store_manager._store_tag_detailed, tag))
 
-                # Fetch relationships (using batch manager's method)
-                futures.append(executor.submit(self.fetch_tag_relationships, tag_id))
+            # Fetch relationships (using batch manager's method)
+            futures.append(self.executor.submit(self.fetch_tag_relationships, tag_id))
 
-                # Fetch related tags details
-                futures.append(executor.submit(self.fetch_related_tags_details, tag_id))
+            # Fetch related tags details
+            futures.append(self.executor.submit(self.fetch_related_tags_details, tag_id))
 
-                # Wait for all to complete and collect results
-                relationships_count = 0
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        # Track relationships count
-                        if isinstance(result, list):
-                            relationships_count += len(result)
-                    except Exception as e:
-                        self.logger.error(f"Error in parallel tag fetch subtask: {e}")
+            # Wait for all to complete and collect results
+            relationships_count = 0
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                    # Track relationships count
+                    if isinstance(result, list):
+                        relationships_count += len(result)
+                except Exception as e:
+                    self.logger.error(f"Error in parallel tag fetch subtask: {e}")
 
-                # Update relationships counter
-                with self._progress_lock:
-                    self._relationships_counter += relationships_count
+            # Update relationships counter
+            with self._progress_lock:
+                self._relationships_counter += relationships_count
 
             return tag
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching tag {tag_id}: {e}")
             return None
 
@@ -118,22 +126,23 @@ class IdTagsManager(DatabaseManager):
             url = f"{self.base_url}/tags/{tag_id}/related-tags"
             params = {"status": "all", "omit_empty": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            relationships = response.json()
+            relationships = orjson.loads(response.content)
 
             if relationships:
                 self.store_manager._store_tag_relationships(relationships)
 
             return relationships
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching relationships for tag {tag_id}: {e}")
             return []
 
@@ -145,21 +154,22 @@ class IdTagsManager(DatabaseManager):
             url = f"{self.base_url}/tags/{tag_id}/related-tags/tags"
             params = {"status": "all", "omit_empty": "true"}
 
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
-            related_tags = response.json()
+            related_tags = orjson.loads(response.content)
 
             if related_tags:
                 self.store_manager._store_tags(related_tags, detailed=True)
 
             return related_tags
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.logger.error(f"Error fetching related tags details for tag {tag_id}: {e}")
             return []
\ No newline at end of file
@@ -3,14 +3,16 @@ ID transactions
 Handles individual fetching for the transactions
 """
 
+import orjson
 from typing import Dict, List
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 from collections import defaultdict
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_transactions import StoreTransactionsManager
+from backend.fetch.http_pool import SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdTransactionsManager(DatabaseManager):
     """Manager for individual transaction fetching"""
@@ -23,6 +25,9 @@ class IdTransactionsManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreTransactionsManager()
         
+        # Process-wide keep-alive session shared with the other fetchers
+        self.session = SHARED_SESSION
+        
         # Reduce max workers to avoid overwhelming the database
         self.max_workers = min(5, (Config.MAX_WORKERS if hasattr(Config, 'MAX_WORKERS') else 5))
         
@@ -50,12 +55,12 @@ class IdTransactionsManager(DatabaseManager):
                 "takerOnly": "false"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, host_limiter(url), url, params=params, timeout=30)
             
             if response.status_code != 200:
                 return {'trades': [], 'whale_trades': []}
             
-            trades = response.json()
+            trades = orjson.loads(response.content)
             
             if not trades:
                 return {'trades': [], 'whale_trades': []}
@@ -89,15 +94,16 @@ class IdTransactionsManager(DatabaseManager):
             url = f"{self.data_api_url}/trades"
             params = {"user": proxy_wallet, "limit": 100}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                trades = response.json() or []
+                trades = orjson.loads(response.content) or []
                 if trades:
                     with self._lock:
                         self.store_manager._store_user_trades(proxy_wallet, trades)
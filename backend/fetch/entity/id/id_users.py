@@ -3,15 +3,17 @@ ID users
 Handles individual fetching for the users
 """
 
+import orjson
 from datetime import datetime
 import time
 from typing import Dict, List, Set, Optional
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 from backend.database.database_manager import DatabaseManager
 from backend.config import Config
 from backend.database.entity.store_users import StoreUsersManager
+from backend.fetch.http_pool import SHARED_EXECUTOR, SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class IdUsersManager(DatabaseManager):
     """Manager for individual user fetching"""
@@ -25,6 +27,10 @@ class IdUsersManager(DatabaseManager):
         self._lock = Lock()  # Thread-safe database operations
         self.store_manager = StoreUsersManager()
         
+        # Process-wide keep-alive session and worker pool shared with the other fetchers
+        self.session = SHARED_SESSION
+        self.executor = SHARED_EXECUTOR
+        
         # Whale thresholds
         self.MIN_WALLET_VALUE = 1000  # $1000 minimum wallet value
         self.MIN_POSITION_VALUE = 250  # $250 minimum position value
@@ -127,21 +133,20 @@ class IdUsersManager(DatabaseManager):
         positions_mgr = PositionsManager()
         
         # Use ThreadPoolExecutor for parallel sub-requests
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = []
-            
-            # Fetch all user data in parallel
-            futures.append(executor.submit(self._fetch_user_trades, proxy_wallet))
-            futures.append(executor.submit(self._fetch_user_activity, proxy_wallet))
-            futures.append(executor.submit(positions_mgr.fetch_user_current_positions, proxy_wallet))
-            futures.append(executor.submit(positions_mgr.fetch_user_closed_positions, proxy_wallet))
-            
-            # Wait for all to complete
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    self.logger.error(f"Error in user enrichment subtask: {e}")
+        futures = []
+        
+        # Fetch all user data in parallel
+        futures.append(self.executor.submit(self._fetch_user_trades, proxy_wallet))
+        futures.append(self.executor.submit(self._fetch_user_activity, proxy_wallet))
+        futures.append(self.executor.submit(positions_mgr.fetch_user_current_positions, proxy_wallet))
+        futures.append(self.executor.submit(positions_mgr.fetch_user_closed_positions, proxy_wallet))
+        
+        # Wait for all to complete
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error in user enrichment subtask: {e}")
 
     def _fetch_user_trades(self, proxy_wallet: str) -> List[Dict]:
         """Fetch user trade history"""
@@ -149,15 +154,16 @@ class IdUsersManager(DatabaseManager):
             url = f"{self.data_api_url}/trades"
             params = {"user": proxy_wallet, "limit": 100}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                trades = response.json() or []
+                trades = orjson.loads(response.content) or []
                 if trades:
                     with self._lock:
                         self.store_manager._store_user_trades(proxy_wallet, trades)
@@ -175,15 +181,16 @@ class IdUsersManager(DatabaseManager):
             url = f"{self.data_api_url}/activity"
             params = {"user": proxy_wallet, "limit": 100}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                activity = response.json() or []
+                activity = orjson.loads(response.content) or []
                 if activity:
                     with self._lock:
                         self.store_manager._store_user_activity(proxy_wallet, activity)
@@ -205,15 +212,16 @@ class IdUsersManager(DatabaseManager):
             url = f"{self.data_api_url}/portfolio-value"
             params = {"user": proxy_wallet}
             
-            response = requests.get(
+            response = throttled_get(
+                self.session,
+                host_limiter(url),
                 url,
                 params=params,
-                headers=self.config.get_api_headers(),
                 timeout=self.config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return data.get('totalValue', 0) if data else 0
             
             return 0
@@ -227,12 +235,12 @@ class IdUsersManager(DatabaseManager):
             url = f"{self.data_api_url}/value"
             params = {"user": proxy_wallet}
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, host_limiter(url), url, params=params, timeout=30)
             
             if response.status_code != 200:
                 return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
             
-            value_data = response.json()
+            value_data = orjson.loads(response.content)
             
             if not value_data or len(value_data) == 0:
                 return {'fetched': False, 'wallet': proxy_wallet, 'value': 0}
@@ -256,12 +264,12 @@ class IdUsersManager(DatabaseManager):
                 "sortDirection": "DESC"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = throttled_get(self.session, host_limiter(url), url, params=params, timeout=30)
             
             if response.status_code != 200:
                 return []
             
-            activities = response.json()
+            activities = orjson.loads(response.content)
             
             if not activities:
                 return []
@@ -0,0 +1,63 @@
+"""
+HTTP pool
+Builds pooled HTTP sessions and the process-wide session/executor shared by the API fetchers
+"""
+
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.config import Config
+
+# Transient statuses retried with exponential backoff (honouring Retry-After)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(pool_size: int = 10, pool_block: bool = False) -> requests.Session:
+    """
+    Create a requests session backed by a keep-alive connection pool
+    Idempotent GETs are retried on connection errors and transient statuses
+
+    Args:
+        pool_size: Number of connections kept alive per host
+        pool_block: Wait for a pooled connection instead of opening (and then
+                    discarding) extra ones when more than pool_size requests are in flight
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+
+    retry = Retry(
+        total=Config.MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry, pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    # API headers are built once here and merged into every request
+    session.headers.update(Config.get_api_headers())
+
+    # Gamma/Data API payloads are large JSON lists that compress well
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+    return session
+
+
+# Process-wide fetch resources: one warm connection pool and one set of worker
+# threads serve every manager that uses them, instead of each building its own per call
+SHARED_EXECUTOR = ThreadPoolExecutor(max_workers=Config.HTTP_WORKERS, thread_name_prefix='fetcher')
+SHARED_SESSION = create_session(pool_size=Config.HTTP_WORKERS, pool_block=True)
+
+
+@atexit.register
+def _close_shared():
+    """Release the shared pool threads and connections at interpreter exit"""
+    SHARED_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    SHARED_SESSION.close()
@@ -0,0 +1,125 @@
+"""
+Rate limiter
+Adaptive token bucket shared by the API fetchers
+"""
+
+import time
+from threading import Lock
+from typing import Dict
+from urllib.parse import urlsplit
+import requests
+from requests.exceptions import RetryError
+
+
+class AIMDLimiter:
+    """
+    Thread-safe token bucket whose refill rate adapts to upstream throttling:
+    the rate halves on every throttle signal (429/5xx after retries) and grows
+    by one request/second after every `increase_every` successful requests
+    """
+
+    def __init__(self, initial_rps: float = 20, min_rps: float = 1, max_rps: float = 50,
+                 increase_every: int = 20):
+        """
+        Args:
+            initial_rps: Starting requests per second
+            min_rps: Floor the rate never drops below
+            max_rps: Ceiling the rate never grows above
+            increase_every: Successful requests needed for each +1 rps step
+        """
+        self.rate = float(initial_rps)
+        self.min_rps = float(min_rps)
+        self.max_rps = float(max_rps)
+        self.increase_every = increase_every
+
+        self._lock = Lock()
+        self._tokens = self.rate
+        self._last_refill = time.monotonic()
+        self._successes = 0
+
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # Burst capacity is one second's worth of requests at the current rate
+                self._tokens = min(self.rate, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def on_throttle(self):
+        """Multiplicative decrease after the server pushed back"""
+        with self._lock:
+            self.rate = max(self.min_rps, self.rate / 2)
+            self._tokens = min(self._tokens, self.rate)
+            self._successes = 0
+
+    def on_success(self):
+        """Additive increase after every `increase_every` successful requests"""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.increase_every:
+                self._successes = 0
+                self.rate = min(self.max_rps, self.rate + 1)
+
+
+# One limiter per API host, shared by every manager that talks to it
+_HOST_LIMITERS: Dict[str, AIMDLimiter] = {}
+_HOST_LIMITERS_LOCK = Lock()
+
+
+def host_limiter(url: str) -> AIMDLimiter:
+    """
+    Return the process-wide limiter for the URL's host, creating it on first use
+
+    Args:
+        url: Any URL on the host (only the network location is used)
+
+    Returns:
+        The AIMDLimiter gating requests to that host
+    """
+    host = urlsplit(url).netloc
+
+    limiter = _HOST_LIMITERS.get(host)
+    if limiter is None:
+        with _HOST_LIMITERS_LOCK:
+            limiter = _HOST_LIMITERS.setdefault(host, AIMDLimiter())
+
+    return limiter
+
+
+def throttled_get(session: requests.Session, limiter: AIMDLimiter, url: str, **kwargs) -> requests.Response:
+    """
+    GET through an AIMD limiter, feeding the outcome back into its rate
+
+    Args:
+        session: Session to send the request with
+        limiter: Limiter gating and adapting the request rate
+        url: Request URL
+        **kwargs: Passed through to session.get
+
+    Returns:
+        The response (RetryError is re-raised after signalling a throttle)
+    """
+    limiter.acquire()
+
+    try:
+        response = session.get(url, **kwargs)
+    except RetryError:
+        # The session's Retry gave up on repeated 429/5xx responses
+        limiter.on_throttle()
+        raise
+
+    if response.status_code == 429 or response.status_code >= 500:
+        limiter.on_throttle()
+    else:
+        limiter.on_success()
+
+    return response
@@ -0,0 +1,118 @@
+"""
+Response cache
+On-disk cache of raw API response bodies so pipeline reruns skip repeated requests
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlencode
+import requests
+from backend.config import Config
+from backend.fetch.rate_limiter import AIMDLimiter, throttled_get
+
+
+class ResponseCache:
+    """Thread-safe SQLite-backed cache of response bodies keyed by URL and params, with a TTL"""
+
+    def __init__(self, path: str, ttl: float):
+        """
+        Args:
+            path: SQLite file holding the cached bodies (kept apart from the main database)
+            ttl: Seconds a cached body stays valid
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: every statement is a single short write
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a request: the URL plus its params in sorted order"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[bytes]:
+        """Return the cached body for the request, or None if missing or expired"""
+        row = self._connection().execute(
+            "SELECT content FROM responses WHERE key = ? AND expires_at > ?",
+            (self.make_key(url, params), time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, url: str, params: Optional[Dict], content: bytes):
+        """Cache a response body for the request"""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, content, expires_at) VALUES (?, ?, ?)",
+            (self.make_key(url, params), content, time.time() + self.ttl)
+        )
+
+    def evict(self, url_prefix: str = '') -> int:
+        """
+        Drop cached bodies whose key starts with url_prefix (all of them by default)
+        along with any expired entries
+
+        Returns:
+            Number of entries removed
+        """
+        cursor = self._connection().execute(
+            "DELETE FROM responses WHERE substr(key, 1, ?) = ? OR expires_at <= ?",
+            (len(url_prefix), url_prefix, time.time())
+        )
+        return cursor.rowcount
+
+
+# Process-wide cache, or None when RESPONSE_CACHE_PATH is unset
+RESPONSE_CACHE = (ResponseCache(Config.RESPONSE_CACHE_PATH, Config.RESPONSE_CACHE_TTL_SECONDS)
+                  if Config.RESPONSE_CACHE_PATH else None)
+
+
+def cached_get_content(session: requests.Session, limiter: AIMDLimiter, url: str,
+                       params: Optional[Dict] = None, timeout: float = 30) -> Optional[bytes]:
+    """
+    Fetch a response body, served from RESPONSE_CACHE when enabled and still fresh
+
+    Args:
+        session: Session to send the request with
+        limiter: Limiter gating the request rate
+        url: Request URL
+        params: Query parameters
+        timeout: Request timeout in seconds
+
+    Returns:
+        The raw body of a 200 response, or None for any other status
+    """
+    if RESPONSE_CACHE is not None:
+        content = RESPONSE_CACHE.get(url, params)
+        if content is not None:
+            return content
+
+    response = throttled_get(session, limiter, url, params=params, timeout=timeout)
+    if response.status_code != 200:
+        return None
+
+    if RESPONSE_CACHE is not None:
+        RESPONSE_CACHE.put(url, params, response.content)
+
+    return response.content
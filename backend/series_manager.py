@@ -3,6 +3,7 @@ Series Manager for Polymarket Terminal
 Handles series data from events and standalone series operations
 """
 
+import orjson
 import requests
 import json
 import time
@@ -15,6 +16,8 @@ from backend.config import Config
 from backend.database.entity.store_series import StoreSeriesManager
 from backend.fetch.entity.batch.batch_series import BatchSeriesManager
 from backend.fetch.entity.id.id_series import IdSeriesManager
+from backend.fetch.http_pool import SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class SeriesManager:
     """Manager for series-related operations"""
@@ -28,6 +31,9 @@ class SeriesManager:
         self.db_manager = DatabaseManager()
         self.store_manager = StoreSeriesManager()
         
+        # Process-wide keep-alive session shared with the other fetchers
+        self.session = SHARED_SESSION
+        
         # Initialize fetchers
         self.batch_fetcher = BatchSeriesManager()
         self.id_fetcher = IdSeriesManager()
@@ -72,15 +78,16 @@ class SeriesManager:
                         "ascending": "false"
                     }
                     
-                    response = requests.get(
+                    response = throttled_get(
+                        self.session,
+                        host_limiter(url),
                         url,
                         params=params,
-                        headers=self.config.get_api_headers(),
                         timeout=self.config.REQUEST_TIMEOUT
                     )
                     response.raise_for_status()
                     
-                    series_list = response.json()
+                    series_list = orjson.loads(response.content)
                     
                     if not series_list:
                         break
@@ -95,7 +102,7 @@ class SeriesManager:
                     if len(series_list) < limit:
                         break
                         
-                except requests.exceptions.RequestException as e:
+                except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
                     self.logger.error(f"Error fetching series at offset {offset}: {e}")
                     break
             
@@ -3,6 +3,7 @@ Tags Manager for Polymarket Terminal
 Handles tag data and tag relationships operations
 """
 
+import orjson
 import requests
 import json
 import time
@@ -15,6 +16,8 @@ from backend.config import Config
 from backend.database.entity.store_tags import StoreTagsManager
 from backend.fetch.entity.batch.batch_tags import BatchTagsManager
 from backend.fetch.entity.id.id_tags import IdTagsManager
+from backend.fetch.http_pool import SHARED_SESSION
+from backend.fetch.rate_limiter import host_limiter, throttled_get
 
 class TagsManager:
     """Manager for tag-related operations and tag relationships"""
@@ -28,9 +31,12 @@ class TagsManager:
         self.db_manager = DatabaseManager()
         self.store_manager = StoreTagsManager()
         
-        # Initialize fetchers
-        self.batch_fetcher = BatchTagsManager()
-        self.id_fetcher = IdTagsManager()
+        # Process-wide keep-alive session shared with the other fetchers
+        self.session = SHARED_SESSION
+        
+        # Initialize fetchers (sharing one store manager and its write lock)
+        self.batch_fetcher = BatchTagsManager(self.store_manager)
+        self.id_fetcher = IdTagsManager(self.store_manager)
         
         # Setup logging
         self.logger = self.db_manager.logger
@@ -69,15 +75,16 @@ class TagsManager:
                         "offset": offset
                     }
 
-                    response = requests.get(
+                    response = throttled_get(
+                        self.session,
+                        host_limiter(url),
                         url,
                         params=params,
-                        headers=self.config.get_api_headers(),
                         timeout=self.config.REQUEST_TIMEOUT
                     )
                     response.raise_for_status()
 
-                    tags_list = response.json()
+                    tags_list = orjson.loads(response.content)
 
                     if not tags_list:
                         break
@@ -94,7 +101,7 @@ class TagsManager:
                     if len(tags_list) < limit:
                         break
 
-                except requests.exceptions.RequestException as e:
+                except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
                     self.logger.error(f"Error fetching tags at offset {offset}: {e}")
                     break
 
@@ -238,14 +245,15 @@ class TagsManager:
                     # Fetch tags for this event
                     url = f"{self.base_url}/events/{event_id}/tags"
 
-                    response = requests.get(
+                    response = throttled_get(
+                        self.session,
+                        host_limiter(url),
                         url,
-                        headers=self.config.get_api_headers(),
                         timeout=self.config.REQUEST_TIMEOUT
                     )
 
                     if response.status_code == 200:
-                        tags_data = response.json()
+                        tags_data = orjson.loads(response.content)
 
                         # Extract tag relationships from response
                         relationships = []